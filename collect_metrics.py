@@ -118,7 +118,8 @@ def main():
     if servers_config['servers']['github'].get('enabled', True):
         github_url = servers_config['servers']['github']['url']
         github_auth = tokens_config.get('github', {})
-        github = GitHubDataSource(github_url, **github_auth)
+        github_cache_file = servers_config['servers']['github'].get('cache_file') or None
+        github = GitHubDataSource(github_url, cache_file=github_cache_file, **github_auth)
         collector.register_data_source('github', github)
         
     if servers_config['servers']['excel'].get('enabled', True):
@@ -355,6 +356,9 @@ def main():
     logger.info(0, "Cleaning up temporary cache files...")
     if 'bitbucket' in collector.data_sources:
         collector.data_sources['bitbucket'].cleanup_cache()
+    for name in ('github', 'jenkins', 'jira', 'sonarqube'):
+        if name in collector.data_sources:
+            collector.data_sources[name].close()
     
     logger.info(0, f"Metrics collection completed. Results exported to {output_path}")
  
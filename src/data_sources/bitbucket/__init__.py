@@ -61,4 +61,5 @@ class BitbucketDataSource:
     
     def cleanup_cache(self):
         """Clean up temporary cache file when done."""
+        self.metrics.clear_memo()
         self.cache.cleanup()
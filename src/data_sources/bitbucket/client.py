@@ -7,6 +7,7 @@ import requests
 import time
 import concurrent.futures
 from urllib.parse import urljoin
+from src.utils.fast_json import response_json
 from src.utils.logger import get_logger
 
 class BitbucketClient:
@@ -76,7 +77,7 @@ class BitbucketClient:
         self.last_request_time = time.time()
         return response
         
-    def fetch_paginated_data(self, endpoint, project_path, page_size=100):
+    def fetch_paginated_data(self, endpoint, project_path, page_size=100, stop_when=None):
         """
         Fetch paginated data from Bitbucket API.
         
@@ -84,6 +85,8 @@ class BitbucketClient:
             endpoint (str): API endpoint to fetch data from
             project_path (str): Project path for logging
             page_size (int, optional): Size of each page. Defaults to 100.
+            stop_when (callable, optional): Called with each page's items; returning True
+                stops pagination early, e.g. once an ordered listing is past the range of interest.
             
         Returns:
             list: List of items from all pages
@@ -100,7 +103,7 @@ class BitbucketClient:
             try:
                 response = self.rate_limited_request(paged_url, self.auth)
                 response.raise_for_status()
-                data = response.json()
+                data = response_json(response)
                 
                 # Get the total count if this is the first page
                 if total_count is None:
@@ -127,6 +130,10 @@ class BitbucketClient:
                     self.logger.info(3, f"Reached last page as reported by API")
                     break
                     
+                if stop_when and stop_when(page_items):
+                    self.logger.info(3, f"Stopping pagination early, remaining pages are out of range")
+                    break
+                    
                 # Get the next page start index directly from the API response
                 if next_start is not None:
                     start = next_start
@@ -139,7 +146,7 @@ class BitbucketClient:
                 break
                 
         # Log summary of pagination
-        if total_count and len(all_items) < total_count:
+        if total_count and len(all_items) < total_count and not stop_when:
             self.logger.warning(3, f"Expected {total_count} items but only fetched {len(all_items)} "
                                f"items from {project_path} in {pages_fetched} pages")
         else:
@@ -168,7 +175,7 @@ class BitbucketClient:
         try:
             response = self.rate_limited_request(pr_detail_url, self.auth)
             response.raise_for_status()
-            return response.json()
+            return response_json(response)
         except requests.exceptions.RequestException as e:
             self.logger.error(3, f"Error fetching details for PR {pr_id}: {e}")
             return None
@@ -191,7 +198,7 @@ class BitbucketClient:
         try:
             response = self.rate_limited_request(pr_activities_url, self.auth)
             response.raise_for_status()
-            return response.json().get('values', [])
+            return response_json(response).get('values', [])
         except requests.exceptions.RequestException as e:
             self.logger.error(3, f"Error fetching activities for PR {pr_id}: {e}")
             return []
@@ -262,174 +269,3 @@ class BitbucketClient:
                     self.logger.error(3, f"Error fetching activities for PR {pr_id}: {e}")
         
         return pr_data
-    
-    def fetch_paginated_data_concurrently(self, endpoint, project_path, page_size=100):
-        """
-        Fetch paginated data from Bitbucket API using concurrent requests.
-        
-        This method first requests the initial page to get the total count,
-        then makes concurrent requests for all required pages.
-        
-        Args:
-            endpoint (str): API endpoint to fetch data from
-            project_path (str): Project path for logging
-            page_size (int, optional): Size of each page. Defaults to 100.
-            
-        Returns:
-            list: List of items from all pages
-        """
-        url = urljoin(self.base_url, endpoint)
-        
-        # Make initial request to get total count
-        initial_url = f"{url}&limit={page_size}"
-        self.logger.info(3, f"Fetching initial page to determine pagination for {project_path}")
-        try:
-            initial_response = self.rate_limited_request(initial_url, self.auth)
-            initial_response.raise_for_status()
-            initial_data = initial_response.json()
-            
-            # Extract initial items
-            all_items = initial_data.get('values', [])
-            
-            # If this is the only page, return immediately
-            if initial_data.get('isLastPage', True):
-                self.logger.info(3, f"Only one page needed for {project_path}")
-                return all_items
-                
-            # Calculate total number of pages needed
-            size = initial_data.get('size', 0)  # Items per page
-            total_count = initial_data.get('total', 0)  # Total items
-            
-            if size == 0:
-                self.logger.warning(3, f"Unable to determine page size for {project_path}")
-                return all_items
-                
-            # Get first page start index
-            next_page_start = initial_data.get('nextPageStart', 0)
-            
-            # Calculate additional pages needed
-            remaining_items = total_count - len(all_items)
-            self.logger.info(3, f"Need to fetch {remaining_items} more items from {project_path} (total count: {total_count})")
-            
-            # Prepare page starts for concurrent fetching
-            # For safety, we'll fetch one page at a time sequentially to respect the nextPageStart
-            # This ensures we're following Bitbucket's pagination properly
-            
-            # First, add the initial next page start
-            next_starts = [next_page_start]
-            
-            # Prefetch some page starts to determine the pagination pattern
-            current_start = next_page_start
-            
-            # We'll fetch a few pages sequentially first to understand the pagination pattern
-            self.logger.info(3, f"Prefetching up to 5 pages to determine pagination pattern")
-            
-            # Maximum number of pages to prefetch
-            max_prefetch = min(5, total_count // page_size + (1 if total_count % page_size > 0 else 0) - 1)
-            
-            for i in range(max_prefetch):
-                paged_url = f"{url}&start={current_start}&limit={page_size}"
-                try:
-                    response = self.rate_limited_request(paged_url, self.auth)
-                    response.raise_for_status()
-                    data = response.json()
-                    
-                    # If this is the last page, break
-                    if data.get('isLastPage', True):
-                        self.logger.info(3, f"Reached last page during prefetch at index {current_start}")
-                        break
-                    
-                    # Get the next page start
-                    next_start = data.get('nextPageStart')
-                    if next_start is not None:
-                        next_starts.append(next_start)
-                        current_start = next_start
-                    else:
-                        # If no nextPageStart is provided, use estimated position
-                        current_start += page_size
-                        next_starts.append(current_start)
-                        
-                    self.logger.info(4, f"Prefetched page with nextPageStart: {next_start}")
-                    
-                except requests.exceptions.RequestException as e:
-                    self.logger.error(3, f"Error prefetching page: {e}")
-                    break
-            
-            # Now that we've learned the pagination pattern, we can fetch the remaining pages
-            page_starts = next_starts
-                
-            self.logger.info(3, f"Preparing to fetch {len(page_starts)} additional pages concurrently for {project_path}")
-            
-            # Define function to fetch a single page
-            def fetch_page(start_index):
-                paged_url = f"{url}&start={start_index}&limit={page_size}"
-                try:
-                    response = self.rate_limited_request(paged_url, self.auth)
-                    response.raise_for_status()
-                    data = response.json()
-                    
-                    # Get the page items
-                    page_items = data.get('values', [])
-                    
-                    # Add detailed logging about the pagination
-                    is_last_page = data.get('isLastPage', True)
-                    next_start = data.get('nextPageStart')
-                    self.logger.info(4, f"Page at index {start_index}: got {len(page_items)} items, " 
-                                      f"isLastPage={is_last_page}, nextPageStart={next_start}")
-                    
-                    return page_items
-                except requests.exceptions.RequestException as e:
-                    self.logger.error(3, f"Error fetching page at index {start_index}: {e}")
-                    return []
-                    
-            # Fetch all pages concurrently
-            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                # Submit all page fetches
-                future_to_start = {executor.submit(fetch_page, start): start for start in page_starts}
-                
-                # Process results as they complete
-                completed = 0
-                total_pages = len(future_to_start)
-                
-                for future in concurrent.futures.as_completed(future_to_start):
-                    completed += 1
-                    if completed % 5 == 0 or completed == total_pages:
-                        self.logger.info(3, f"Completed {completed}/{total_pages} page fetches for {project_path}")
-                        
-                    try:
-                        page_items = future.result()
-                        all_items.extend(page_items)
-                    except Exception as e:
-                        start_index = future_to_start[future]
-                        self.logger.error(3, f"Error processing page at index {start_index}: {e}")
-                        
-            # If we didn't get all the items we expected, try sequential fetching
-            if len(all_items) < total_count:
-                self.logger.warning(3, f"Expected {total_count} items but only fetched {len(all_items)} items. " 
-                                   f"Attempting sequential fetch to ensure we get all items.")
-                
-                # Store existing items in a set for quick lookup
-                existing_ids = set()
-                for item in all_items:
-                    if 'id' in item:
-                        existing_ids.add(item['id'])
-                
-                # Do a complete sequential fetch to ensure we get everything
-                seq_items = self.fetch_paginated_data(endpoint, project_path, page_size)
-                
-                # Add any items we didn't already get
-                new_items_count = 0
-                for item in seq_items:
-                    if 'id' in item and item['id'] not in existing_ids:
-                        all_items.append(item)
-                        existing_ids.add(item['id'])
-                        new_items_count += 1
-                
-                self.logger.info(3, f"Sequential fetch added {new_items_count} new items")
-            
-            self.logger.info(3, f"Fetched a total of {len(all_items)} items from {project_path} (expected: {total_count})")
-            return all_items
-            
-        except requests.exceptions.RequestException as e:
-            self.logger.error(3, f"Error fetching initial page: {e}")
-            return []
@@ -4,9 +4,27 @@ Provides functionality for calculating various metrics from Bitbucket PR data.
 """
 
 import calendar
+import functools
 from datetime import datetime
-from dateutil import parser
-import pytz
+
+# PR state compared against after states are normalized to upper case at ingest
+_MERGED = 'MERGED'
+
+def _month_bounds_ms(year_int, month_int, last_day):
+    """
+    Get the UTC epoch bounds of a month in milliseconds, as used by Bitbucket timestamps.
+    
+    Args:
+        year_int (int): Year
+        month_int (int): Month
+        last_day (int): Last day of the month
+        
+    Returns:
+        tuple: (start_timestamp, end_timestamp) covering 00:00:00.000 to 23:59:59.999 UTC
+    """
+    start_timestamp = calendar.timegm((year_int, month_int, 1, 0, 0, 0)) * 1000
+    end_timestamp = calendar.timegm((year_int, month_int, last_day, 23, 59, 59)) * 1000 + 999
+    return start_timestamp, end_timestamp
 
 class BitbucketMetrics:
     """
@@ -23,8 +41,28 @@ class BitbucketMetrics:
         self.client = client
         self.cache = cache
         self.logger = client.logger
+        # Per-instance memo so repeated metric calls for the same month skip the cache layer
+        self._fetch_pr_data_cached = functools.lru_cache(maxsize=64)(self._fetch_pr_data_impl)
         
     def _fetch_pr_data(self, project_path, year, month):
+        """
+        Fetch PR data, memoized per instance for the same project and month.
+        
+        Args:
+            project_path (str): Project path in format "PROJECT/REPO"
+            year (str): Year (e.g. "2025")
+            month (str): Month (e.g. "05")
+            
+        Returns:
+            dict: PR data including details and activities
+        """
+        return self._fetch_pr_data_cached(project_path, year, month)
+        
+    def clear_memo(self):
+        """Drop memoized PR data so the next fetch goes back to the cache or API."""
+        self._fetch_pr_data_cached.cache_clear()
+        
+    def _fetch_pr_data_impl(self, project_path, year, month):
         """
         Fetch PR data from cache or API.
         
@@ -42,6 +80,8 @@ class BitbucketMetrics:
             self.logger.info(2, f"Using cached PR data for {project_path} ({year}-{month})")
             # Log cache stats to help diagnose any issues
             self.logger.info(3, f"Cache stats: {len(cached_data.get('prs', []))} PRs, {len(cached_data.get('activities', {}))} PR activity records")
+            if 'columns' not in cached_data:
+                cached_data['columns'] = self._build_columns(cached_data)
             return cached_data
             
         # If not in cache, fetch from API
@@ -55,23 +95,25 @@ class BitbucketMetrics:
         # Get the last day of the month
         _, last_day = calendar.monthrange(year_int, month_int)
         
-        # Format dates for the API
-        start_date = f"{year}-{month}-01T00:00:00.000Z"
-        end_date = f"{year}-{month}-{last_day}T23:59:59.999Z"
+        # Month bounds as millisecond timestamps for filtering
+        start_timestamp, end_timestamp = _month_bounds_ms(year_int, month_int, last_day)
         
         # Construct API endpoint for pull requests - use maximum allowed page size
-        api_endpoint = f"/rest/api/1.0/projects/{project}/repos/{repo}/pull-requests?state=ALL&limit=1000"
+        # Attributes and properties (comment/task counts etc.) are not needed for pre-filtering, so skip them
+        # NEWEST returns the most recently updated PRs first, which lets us stop once we are past the month
+        api_endpoint = (f"/rest/api/1.0/projects/{project}/repos/{repo}/pull-requests"
+                        f"?state=ALL&order=NEWEST&limit=1000&withAttributes=false&withProperties=false")
         self.logger.info(2, f"Fetching PRs with endpoint: {api_endpoint}")
         
-        # Fetch all PRs using concurrent pagination for improved performance
+        # Fetch pages lazily and stop as soon as a page is entirely older than the month
         # Using a larger page size (1000) to minimize the number of API calls needed
-        all_prs = self.client.fetch_paginated_data_concurrently(api_endpoint, project_path, page_size=1000)
+        all_prs = self.client.fetch_paginated_data(
+            api_endpoint, project_path, page_size=1000,
+            stop_when=lambda page: self._page_ends_before(page, start_timestamp)
+        )
+        self._normalize_states(all_prs)
         self.logger.info(3, f"Total PRs fetched: {len(all_prs)}. Pre-filtering PRs by date range.")
         
-        # Convert date strings to timestamps for filtering
-        start_timestamp = int(parser.parse(start_date).timestamp() * 1000)
-        end_timestamp = int(parser.parse(end_date).timestamp() * 1000)
-        
         # Pre-filter PRs by date range to reduce API calls
         filtered_prs = self._pre_filter_prs_by_date_range(all_prs, start_timestamp, end_timestamp)
         pre_filter_percentage = (len(filtered_prs) / len(all_prs) * 100) if all_prs else 0
@@ -79,17 +121,93 @@ class BitbucketMetrics:
         
         # Fetch details and activities for each PR
         pr_data = self.client.fetch_pr_data_concurrently(project, repo, filtered_prs)
+        self._normalize_states(pr_data["prs"])
+        
+        # Precompute the per-PR fields the metrics need so they are cached with the data
+        pr_data["columns"] = self._build_columns(pr_data)
         
         # Cache the data
         self.cache.put(project_path, year, month, pr_data)
         
         return pr_data
         
+    @staticmethod
+    def _build_columns(pr_data):
+        """
+        Extract the fields used by the metrics into parallel lists, one entry per PR.
+        
+        This is done once per project and month so the metric methods do not need to
+        walk the PR details and scan activities on every call.
+        
+        Args:
+            pr_data (dict): PR data including details and activities
+            
+        Returns:
+            dict: Lists keyed by 'id', 'is_merged', 'closed_ts', 'created_ts' and 'approval_ts'
+                (the first APPROVED activity timestamp, or None)
+        """
+        activities_data = pr_data.get("activities", {})
+        columns = {'id': [], 'is_merged': [], 'closed_ts': [], 'created_ts': [], 'approval_ts': []}
+        
+        for pr in pr_data.get("prs", []):
+            pr_id = pr.get('id')
+            approval_date = next(
+                (activity.get('createdDate') for activity in activities_data.get(str(pr_id), [])
+                 if activity.get('action') == 'APPROVED'),
+                None
+            )
+            columns['id'].append(pr_id)
+            columns['is_merged'].append(pr.get('state') == _MERGED)
+            columns['closed_ts'].append(pr.get('closedDate'))
+            columns['created_ts'].append(pr.get('createdDate'))
+            columns['approval_ts'].append(approval_date)
+            
+        return columns
+        
+    @staticmethod
+    def _normalize_states(prs):
+        """
+        Upper-case the state of each PR in place so later comparisons need no conversion.
+        
+        Args:
+            prs (list): List of PR dictionaries
+        """
+        for pr in prs:
+            state = pr.get('state')
+            if state:
+                pr['state'] = state.upper()
+        
+    @staticmethod
+    def _page_ends_before(prs, start_timestamp):
+        """
+        Check whether a page of PRs is ordered newest-updated first and ends before a timestamp.
+        
+        A PR cannot be closed after it was last updated, so once an ordered listing reaches PRs
+        last updated before the month starts, no later PR can have been merged within it.
+        
+        Args:
+            prs (list): List of PRs from one page of the listing
+            start_timestamp (int): Start timestamp in milliseconds
+            
+        Returns:
+            bool: True if the remaining pages can be skipped
+        """
+        updated = [pr.get('updatedDate') for pr in prs]
+        if not updated or None in updated:
+            return False
+        if any(newer < older for newer, older in zip(updated, updated[1:])):
+            # Not ordered as expected, so it is not safe to stop
+            return False
+        return updated[-1] < start_timestamp
+        
     def _pre_filter_prs_by_date_range(self, prs, start_timestamp, end_timestamp):
         """
         Pre-filter PRs by date range to avoid fetching details for PRs that won't be counted.
         This is an optimization to reduce the number of API calls.
         
+        PRs are expected newest-updated first; while that order holds, the scan stops at the
+        first PR last updated before the range, since no later PR can have closed within it.
+        
         Args:
             prs (list): List of PRs from initial fetch
             start_timestamp (int): Start timestamp in milliseconds
@@ -103,18 +221,29 @@ class BitbucketMetrics:
         
         filtered_prs = []
         skipped_count = 0
+        ordered = True
+        previous_updated = None
         
-        for pr in prs:
+        for index, pr in enumerate(prs):
             include_pr = False
             
+            # Stop early once the newest-first order reaches PRs last updated before the range
+            updated_date = pr.get('updatedDate')
+            if updated_date is None or (previous_updated is not None and updated_date > previous_updated):
+                ordered = False
+            previous_updated = updated_date
+            if ordered and updated_date < start_timestamp:
+                skipped_count += len(prs) - index
+                break
+            
             # Extract closed date from the PR
             closed_date = pr.get('closedDate')
             
             # PR state (note that initial PR data might not have complete state info)
-            state = pr.get('state', '').upper()
+            state = pr.get('state')
             
             # Only include PRs that are MERGED and closed within our date range
-            if closed_date and start_timestamp <= closed_date <= end_timestamp and state == 'MERGED':
+            if closed_date and start_timestamp <= closed_date <= end_timestamp and state == _MERGED:
                 include_pr = True
                 
             if include_pr:
@@ -152,35 +281,28 @@ class BitbucketMetrics:
         
         # Convert start and end dates to UTC timestamps in milliseconds for comparison
         # Bitbucket API uses UTC timestamps (in milliseconds since epoch)
-        
-        # Parse ISO format dates with timezone info
-        start_dt = parser.parse(start_date_str)
-        end_dt = parser.parse(end_date_str)
-        
-        # Convert to milliseconds timestamp (same format as Bitbucket API)
-        start_timestamp = int(start_dt.timestamp() * 1000)
-        end_timestamp = int(end_dt.timestamp() * 1000)
+        start_timestamp, end_timestamp = _month_bounds_ms(year_int, month_int, last_day)
         
         # Fetch PR data from cache or API
         pr_data = self._fetch_pr_data(project_path, year, month)
-        detailed_prs = pr_data["prs"]
+        columns = pr_data["columns"]
         
         self.logger.info(3, f"Filtering merged PRs between {start_date_str} and {end_date_str} (timestamps: {start_timestamp} - {end_timestamp})")
         
-        # Count total merged PRs in dataset
-        total_merged_count = len([pr for pr in detailed_prs if pr.get('state', '').upper() == 'MERGED'])
-        merged_with_closed_date = len([pr for pr in detailed_prs 
-                                      if pr.get('state', '').upper() == 'MERGED' and pr.get('closedDate')])
-        
-        # Filter PRs by closedDate that fall within our date range AND are in MERGED state
-        filtered_prs = [
-            pr for pr in detailed_prs
-            if pr.get('closedDate') 
-            and start_timestamp <= pr.get('closedDate') <= end_timestamp
-            and pr.get('state', '').upper() == 'MERGED'
+        # Closed dates of merged PRs, from the precomputed columns
+        merged_closed_dates = [
+            closed_date for is_merged, closed_date in zip(columns['is_merged'], columns['closed_ts'])
+            if is_merged
         ]
+        total_merged_count = len(merged_closed_dates)
+        merged_with_closed_date = sum(1 for closed_date in merged_closed_dates if closed_date)
+        
+        # Count merged PRs whose closedDate falls within our date range
+        pr_count = sum(
+            1 for closed_date in merged_closed_dates
+            if closed_date and start_timestamp <= closed_date <= end_timestamp
+        )
         
-        pr_count = len(filtered_prs)
         self.logger.info(3, f"Found {pr_count} merged PRs in {project_path} for {year}-{month} "
                           f"(out of {total_merged_count} total merged PRs, {merged_with_closed_date} with closed dates)")
         
@@ -212,17 +334,12 @@ class BitbucketMetrics:
         
         # Fetch PR data from cache or API
         pr_data = self._fetch_pr_data(project_path, year, month)
-        detailed_prs = pr_data["prs"]
-        activities_data = pr_data["activities"]
+        columns = pr_data["columns"]
         
         # Calculate PR review time (creation to approval) for all PRs
-        aus_timezone = pytz.timezone('Australia/Sydney')
-        start_dt = parser.parse(start_date_str).astimezone(aus_timezone)
-        end_dt = parser.parse(end_date_str).astimezone(aus_timezone)
-        start_timestamp = int(start_dt.timestamp() * 1000)
-        end_timestamp = int(end_dt.timestamp() * 1000)
+        start_timestamp, end_timestamp = _month_bounds_ms(year_int, month_int, last_day)
         
-        self.logger.info(3, f"Calculating PR review times between {start_date_str} and {end_date_str} for {len(detailed_prs)} PRs")
+        self.logger.info(3, f"Calculating PR review times between {start_date_str} and {end_date_str} for {len(columns['id'])} PRs")
         
         total_review_time = 0
         pr_count = 0
@@ -232,28 +349,18 @@ class BitbucketMetrics:
         
         skipped_not_merged = 0
         
-        for pr in detailed_prs:
+        # The first approval of each PR is precomputed, so no activity scan is needed here
+        for pr_id, is_merged, created_date, approval_date in zip(
+                columns['id'], columns['is_merged'], columns['created_ts'], columns['approval_ts']):
             # Only consider MERGED PRs
-            if pr.get('state', '').upper() != 'MERGED':
+            if not is_merged:
                 skipped_not_merged += 1
                 continue
             
-            created_date = pr.get('createdDate')
-            pr_id = pr.get('id')
-            
             # Skip PRs with no creation date
             if not created_date:
                 skipped_no_created += 1
                 continue
-                
-            # Get cached activities for this PR
-            activities = activities_data.get(str(pr_id), [])
-            approval_date = None
-            
-            for activity in activities:
-                if activity.get('action') == 'APPROVED':
-                    approval_date = activity.get('createdDate')
-                    break
             
             # Skip PRs with no approval date
             if not approval_date:
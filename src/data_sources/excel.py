@@ -5,8 +5,39 @@ This module provides functionality for reading data from Excel files.
 """
 
 import os
-import pandas as pd
+import re
 from datetime import datetime
+from openpyxl import load_workbook
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SATISFIED_RE = re.compile(r'\b[45]\b')
+_FREQUENTLY_RE = re.compile(re.escape('Frequently (70+%)'), re.IGNORECASE)
+_STRONGLY_AGREE_RE = re.compile('Strongly agree', re.IGNORECASE)
+
+# Survey columns as (Excel column letter, 0-based index, answer pattern, metric, log label)
+_SURVEY_COLS = (
+    ('Q', 16, _SATISFIED_RE, 'user_satisfaction', "responses containing '4' or '5'"),
+    ('G', 6, _FREQUENTLY_RE, 'adoption', "'Frequently (70+%)' responses"),
+    ('S', 18, _STRONGLY_AGREE_RE, 'productivity', "'Strongly agree' responses"),
+    ('T', 19, _STRONGLY_AGREE_RE, 'productivity', "'Strongly agree' responses"),
+    ('U', 20, _STRONGLY_AGREE_RE, 'productivity', "'Strongly agree' responses"),
+    ('V', 21, _STRONGLY_AGREE_RE, 'productivity', "'Strongly agree' responses"),
+)
+
+
+def _cell_matches(row, idx, pattern):
+    """Return True if the cell at idx in a row tuple is set and matches the pattern."""
+    if idx >= len(row):
+        return False
+    value = row[idx]
+    if value is None:
+        return False
+    # Most answers are already text, so only convert numeric cells such as ratings
+    if not isinstance(value, str):
+        value = str(value)
+    return pattern.search(value) is not None
 
 class ExcelDataSource:
     """
@@ -36,9 +67,6 @@ class ExcelDataSource:
         Returns:
             dict: Dictionary with survey metrics as percentages
         """
-        from src.utils.logger import get_logger
-        logger = get_logger(__name__)
-        
         year_month = f"{year}-{month}"
         excel_path = os.path.join(self.base_path, f"{year_month}.xlsx")
         
@@ -52,10 +80,31 @@ class ExcelDataSource:
         
         try:
             logger.info(2, f"Processing survey results from {excel_path}")
-            df = pd.read_excel(excel_path)
             
-            # Get total number of responses (rows in the dataframe)
-            total_responses = len(df)
+            # Stream the sheet row by row in read-only mode rather than building a DataFrame
+            total_responses = 0
+            column_counts = [0] * len(_SURVEY_COLS)
+            workbook = load_workbook(excel_path, read_only=True, data_only=True)
+            try:
+                # Read-only mode trusts the sheet's stored dimension, which can be stale (e.g. A1:A1), so recompute it
+                ws = workbook.active
+                ws.reset_dimensions()
+                rows = ws.iter_rows(values_only=True)
+                header = next(rows, ())
+                num_columns = len(header)
+                
+                for row in rows:
+                    # Skip rows with no answers at all, such as formatted but empty rows
+                    if all(value is None for value in row):
+                        continue
+                    total_responses += 1
+                    
+                    for i, (_, idx, pattern, _, _) in enumerate(_SURVEY_COLS):
+                        if _cell_matches(row, idx, pattern):
+                            column_counts[i] += 1
+            finally:
+                workbook.close()
+            
             if total_responses == 0:
                 logger.warning(3, "Survey file contains no responses")
                 return {
@@ -66,44 +115,17 @@ class ExcelDataSource:
             
             logger.info(3, f"Total survey responses: {total_responses}")
             
-            # Excel uses 0-based indices internally, so we need to convert letter-based column references
-            # Map Excel column letters to 0-based indices
-            col_to_idx = {
-                'G': 6,  # Column G is the 7th column (0-indexed)
-                'Q': 16, # Column Q is the 17th column (0-indexed)
-                'S': 18, # Column S is the 19th column (0-indexed)
-                'T': 19, # Column T is the 20th column (0-indexed)
-                'U': 20, # Column U is the 21st column (0-indexed)
-                'V': 21, # Column V is the 22nd column (0-indexed)
-            }
-            
-            # Count fields in column Y that contain "Very disappointed" for user_satisfaction
-            user_satisfaction_count = 0
-            q_idx = col_to_idx['Q']
-            if q_idx < len(df.columns):
-                user_satisfaction_count = df.iloc[:, q_idx].astype(str).str.contains(r'\b[45]\b', case=False, na=False).sum()
-                logger.info(3, f"Found {user_satisfaction_count} responses containing '4' or '5' in column Q (index {q_idx})")
-            else:
-                logger.warning(3, f"Column Q (index {q_idx}) not found in survey results with {len(df.columns)} columns")
-
-            # Count fields in column G that contain "Frequently (70+%)" for adoption
-            adoption_count = 0
-            g_idx = col_to_idx['G']
-            if g_idx < len(df.columns):
-                adoption_count = df.iloc[:, g_idx].astype(str).str.contains('Frequently (70+%)', case=False, na=False).sum()
-                logger.info(3, f"Found {adoption_count} 'Frequently (70+%)' responses in column G (index {g_idx})")
-            else:
-                logger.warning(3, f"Column G (index {g_idx}) not found in survey results with {len(df.columns)} columns")
-            
-            # Count fields in columns S, T, U and V that contain "Strongly agree" for productivity
-            productivity_count = 0
-            for col, idx in {'S': col_to_idx['S'], 'T': col_to_idx['T'], 'U': col_to_idx['U'], 'V': col_to_idx['V']}.items():
-                if idx < len(df.columns):
-                    col_count = df.iloc[:, idx].astype(str).str.contains('Strongly agree', case=False, na=False).sum()
-                    productivity_count += col_count
-                    logger.info(3, f"Found {col_count} 'Strongly agree' responses in column {col} (index {idx})")
+            # Add each column's count to its metric, skipping columns the survey does not have
+            counts = {'user_satisfaction': 0, 'adoption': 0, 'productivity': 0}
+            for (col, idx, _, key, label), col_count in zip(_SURVEY_COLS, column_counts):
+                if idx < num_columns:
+                    counts[key] += col_count
+                    logger.info(3, f"Found {col_count} {label} in column {col} (index {idx})")
                 else:
-                    logger.warning(3, f"Column {col} (index {idx}) not found in survey results with {len(df.columns)} columns")
+                    logger.warning(3, f"Column {col} (index {idx}) not found in survey results with {num_columns} columns")
+            user_satisfaction_count = counts['user_satisfaction']
+            adoption_count = counts['adoption']
+            productivity_count = counts['productivity']
             
             # Convert counts to percentages
             user_satisfaction_pct = round((user_satisfaction_count / total_responses), 4) if total_responses > 0 else 0
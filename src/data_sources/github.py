@@ -2,20 +2,95 @@
 GitHub data source for retrieving metrics from GitHub and GitHub Enterprise.
 """
  
+import os
+import time
+import tempfile
+import bisect
+import functools
+import operator
+import concurrent.futures
+import threading
 import requests
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 import calendar
-from urllib.parse import urljoin
 import json
+from src.utils.fast_json import response_json
+from src.utils.http import make_session, SessionMixin
 from src.utils.logger import get_logger
  
  
-class GitHubDataSource:
+@functools.lru_cache(maxsize=256)
+def _month_prefix(year, month):
+    """Return the 'YYYY-MM' prefix that daily Copilot metrics dates for a month start with."""
+    return f"{year}-{month:0>2}"  # Ensures month is two digits
+
+
+# Both line counts of a per-language completion record in one C-level lookup
+_LANGUAGE_LINES = operator.itemgetter('total_code_lines_suggested', 'total_code_lines_accepted')
+
+
+def _safe_api(default, action):
+    """
+    Decorate a data source getter so request failures are logged and the default returned.
+   
+    Args:
+        default: Value to return if the request fails
+        action (str): Description of what failed, used in the error message
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return func(self, *args, **kwargs)
+            except requests.exceptions.RequestException as e:
+                self.logger.error(3, f"Error {action}: {e}")
+                return default
+        return wrapper
+    return decorator
+
+
+def _entry_date(entry):
+    """Return the date of a daily Copilot metrics entry, used to sort and search the entries."""
+    return entry.get('date', '')
+
+
+def _user_cache_dir():
+    """Return this tool's per-user cache directory, following the XDG base directory convention."""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'transit')
+
+
+class RateLimitError(requests.exceptions.HTTPError):
+    """Raised when the GitHub API rate limit is exhausted and the request cannot be retried in time."""
+
+
+class GitHubDataSource(SessionMixin):
     """
     Data source for connecting to a GitHub/GitHub Enterprise server and retrieving metrics.
     """
    
-    def __init__(self, base_url, token=None, username=None, password=None):
+    # Seconds before cached Copilot metrics are revalidated with the server
+    METRICS_CACHE_TTL = 300
+   
+    # Largest page size the Copilot metrics endpoint accepts
+    METRICS_PAGE_SIZE = 100
+   
+    # Longest rate limit reset, in seconds, worth sleeping through before retrying
+    MAX_RATE_LIMIT_WAIT = 60
+   
+    # Times a rate limited request is retried before giving up
+    MAX_RATE_LIMIT_RETRIES = 3
+   
+    # Remaining requests in the rate limit window below which requests are spaced out until it resets
+    RATE_LIMIT_LOW_WATER = 50
+   
+    # Days after a month ends before its Copilot totals are treated as final and kept on disk
+    PERSIST_AFTER_DAYS = 2
+   
+    # Requests allowed in flight at once, kept low to avoid GitHub's secondary rate limits
+    MAX_CONCURRENT_REQUESTS = 4
+   
+    def __init__(self, base_url, token=None, username=None, password=None, cache_file=None):
         """
         Initialize the GitHubDataSource.
        
@@ -24,6 +99,9 @@ class GitHubDataSource:
             token (str, optional): Personal access token for API access
             username (str, optional): Username for basic authentication (not preferred for GitHub)
             password (str, optional): Password for basic authentication (not preferred for GitHub)
+            cache_file (str, optional): JSON file keeping totals for finished months between runs.
+                                        Defaults to a file in the user's cache directory
+                                        ($XDG_CACHE_HOME/transit, or ~/.cache/transit).
        
         Note:
             Token authentication is strongly recommended for GitHub.
@@ -46,8 +124,364 @@ class GitHubDataSource:
             self.logger.warning(3, "Basic authentication for GitHub API is deprecated. Token authentication is recommended.")
         else:
             raise ValueError("Authentication credentials must be provided. Token authentication is recommended.")
+       
+        # Rate limits (429, and 403 with an exhausted budget) are left to _get, which caps the wait at
+        # MAX_RATE_LIMIT_WAIT; urllib3 would sleep out any Retry-After in full while holding a request slot
+        self.session = make_session(self.headers, self.auth, status_forcelist=(500, 502, 503, 504),
+                                    pool_connections=4, pool_maxsize=16, backoff_factor=0.5,
+                                    respect_retry_after_header=False)
+       
+        # Copilot metrics per organization as (fetched_at, etag, entries, dates), shared by all the metric getters;
+        # dates lists each entry's date in the same sorted order, so a month can be bisected without bisect's key=
+        self._metrics_cache = {}
+       
+        # Downloads in progress per organization, so concurrent getters wait on one request instead of repeating it
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+       
+        # Errors that retrying cannot fix (bad token, no access, unknown enterprise) per organization
+        self._metrics_failures = {}
+       
+        # Monthly totals per (organization, month) as (entries, totals), valid while the cached entries are unchanged
+        self._totals_cache = {}
+       
+        # Last seen X-RateLimit-Remaining and X-RateLimit-Reset, shared by all threads using this source
+        self._request_slots = threading.BoundedSemaphore(self.MAX_CONCURRENT_REQUESTS)
+        self._rate_limit_lock = threading.Lock()
+        self._rate_limit_remaining = None
+        self._rate_limit_reset = 0
+       
+        # Totals for finished months survive between runs, since the metrics API only keeps recent days
+        self.cache_file = cache_file or os.path.join(_user_cache_dir(), "github_copilot_totals_cache.json")
+        self._persisted_totals = None  # Loaded from cache_file on first use
+        self._persist_lock = threading.Lock()
+   
+    @staticmethod
+    def _rate_limit_wait(response):
+        """
+        Work out how long to wait before retrying a rate limited response.
+       
+        Args:
+            response: 403 or 429 response from the GitHub API
+           
+        Returns:
+            float: Seconds to wait, or None if the response is not a rate limit
+        """
+        retry_after = response.headers.get('Retry-After')
+        if retry_after is not None:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                return None
+        if response.headers.get('X-RateLimit-Remaining') == '0':
+            try:
+                return max(0.0, int(response.headers.get('X-RateLimit-Reset', '')) - time.time())
+            except ValueError:
+                return None
+        # A 403 without rate limit headers is a permissions problem, not throttling
+        return None
+   
+    def _record_rate_limit(self, response):
+        """Remember the rate limit budget reported by a response's X-RateLimit headers."""
+        try:
+            remaining = int(response.headers['X-RateLimit-Remaining'])
+            reset = int(response.headers['X-RateLimit-Reset'])
+        except (KeyError, ValueError):
+            return
+        with self._rate_limit_lock:
+            self._rate_limit_remaining = remaining
+            self._rate_limit_reset = reset
+   
+    def _throttle(self, url):
+        """
+        Spread the remaining requests evenly over the rest of the window once the budget runs low.
+       
+        Raises:
+            RateLimitError: If the budget is used up and does not reset within MAX_RATE_LIMIT_WAIT seconds
+        """
+        with self._rate_limit_lock:
+            remaining = self._rate_limit_remaining
+            reset = self._rate_limit_reset
+        if remaining is None or remaining >= self.RATE_LIMIT_LOW_WATER:
+            return
+        until_reset = reset - time.time()
+        if until_reset <= 0:
+            return
+        if remaining == 0 and until_reset > self.MAX_RATE_LIMIT_WAIT:
+            # Do not spend a request that is certain to be rejected
+            raise RateLimitError(f"GitHub rate limit exhausted for {url}, resets in {until_reset:.0f}s")
+        time.sleep(min(until_reset / max(remaining, 1), self.MAX_RATE_LIMIT_WAIT))
+   
+    def _get(self, url, **kwargs):
+        """
+        GET a URL with the shared session, pacing requests to the rate limit and backing off when throttled.
+       
+        Args:
+            url (str): URL to request
+            **kwargs: Additional arguments passed to requests
+           
+        Returns:
+            Response: HTTP response object
+           
+        Raises:
+            RateLimitError: If the request is still rate limited after MAX_RATE_LIMIT_RETRIES retries,
+                or the rate limit does not reset within MAX_RATE_LIMIT_WAIT seconds
+        """
+        for attempt in range(self.MAX_RATE_LIMIT_RETRIES + 1):
+            self._throttle(url)
+            with self._request_slots:
+                response = self.session.get(url, **kwargs)
+            self._record_rate_limit(response)
+            if response.status_code not in (403, 429):
+                return response
+           
+            wait = self._rate_limit_wait(response)
+            if wait is None:
+                return response
+            if wait > self.MAX_RATE_LIMIT_WAIT or attempt == self.MAX_RATE_LIMIT_RETRIES:
+                break
+            self.logger.warning(3, f"GitHub rate limit reached, retrying in {wait:.0f}s")
+            time.sleep(wait)
+        raise RateLimitError(f"GitHub rate limit exceeded for {url}", response=response)
+   
+    def _fetch_copilot_metrics(self, organization):
+        """
+        Fetch the daily Copilot metrics entries for an organization.
+       
+        Every metric getter reads the same /copilot/metrics payload, so it is downloaded
+        on first use and the parsed entries are reused by the other getters. Once older than
+        METRICS_CACHE_TTL the entries are revalidated with the ETag from the last response,
+        and a 304 Not Modified keeps them without downloading the payload again.
+       
+        Args:
+            organization (str): GitHub organization name
+           
+        Returns:
+            tuple: (entries, dates) - daily Copilot metrics entries sorted by date, and their dates
+           
+        Raises:
+            requests.exceptions.RequestException: If the metrics could not be fetched
+        """
+        failure = self._metrics_failures.get(organization)
+        if failure and time.monotonic() - failure[0] < self.METRICS_CACHE_TTL:
+            raise failure[1]
+       
+        cached = self._metrics_cache.get(organization)
+        if cached and time.monotonic() - cached[0] < self.METRICS_CACHE_TTL:
+            return cached[2], cached[3]
+       
+        with self._inflight_lock:
+            # Another caller may have finished the download while this one was waiting for the lock
+            cached = self._metrics_cache.get(organization)
+            if cached and time.monotonic() - cached[0] < self.METRICS_CACHE_TTL:
+                return cached[2], cached[3]
+            future = self._inflight.get(organization)
+            is_owner = future is None
+            if is_owner:
+                future = concurrent.futures.Future()
+                self._inflight[organization] = future
+       
+        if not is_owner:
+            return future.result()
+       
+        try:
+            metrics = self._download_copilot_metrics(organization, cached)
+        except Exception as e:
+            if self._is_unrecoverable(e):
+                # Let the other getters for this organization fail fast instead of repeating a request that cannot succeed
+                self._metrics_failures[organization] = (time.monotonic(), e)
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(metrics)
+            return metrics
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(organization, None)
+   
+    @staticmethod
+    def _is_unrecoverable(error):
+        """Return True for HTTP errors that retrying the same request cannot fix, such as 401, 403 or 404."""
+        if isinstance(error, RateLimitError) or not isinstance(error, requests.exceptions.HTTPError):
+            return False
+        return error.response is not None and error.response.status_code in (401, 403, 404)
+   
+    def _download_copilot_metrics(self, organization, cached):
+        """
+        Download all pages of Copilot metrics for an organization and store them in the cache.
+       
+        Args:
+            organization (str): GitHub organization name
+            cached (tuple): Stale (fetched_at, etag, entries, dates) to revalidate, or None
+           
+        Returns:
+            tuple: (entries, dates) - daily Copilot metrics entries sorted by date, and their dates
+        """
+        # Construct API endpoint for Copilot metrics
+        api_endpoint = f"/enterprises/{organization}/copilot/metrics"
+        url = f"{self.base_url}{api_endpoint}"
+       
+        # Revalidate stale entries instead of downloading them again if they have not changed
+        headers = {'If-None-Match': cached[1]} if cached and cached[1] else None
+       
+        # Query the GitHub API for Copilot metrics, asking for the largest page size
+        response = self._get(url, headers=headers, params={'per_page': self.METRICS_PAGE_SIZE})
+        if cached and response.status_code == 304:
+            self._metrics_cache[organization] = (time.monotonic(), *cached[1:])
+            return cached[2], cached[3]
+        response.raise_for_status()
+        etag = response.headers.get('ETag')
+        entries = self._metrics_entries(response_json(response))
+       
+        # Follow Link rel="next" so days beyond the first page are not silently dropped
+        next_url = response.links.get('next', {}).get('url')
+        while next_url:
+            response = self._get(next_url)
+            response.raise_for_status()
+            entries.extend(self._metrics_entries(response_json(response)))
+            next_url = response.links.get('next', {}).get('url')
+       
+        # Keep entries in date order, with their dates alongside, so a month can be located by binary search
+        entries.sort(key=_entry_date)
+        dates = [_entry_date(entry) for entry in entries]
+        self._metrics_cache[organization] = (time.monotonic(), etag, entries, dates)
+        return entries, dates
+   
+    @staticmethod
+    def _metrics_entries(data):
+        """Return the list of daily entries from a Copilot metrics page, which may be a list or a dict."""
+        # Handle if data is a list or dict
+        if isinstance(data, dict):
+            return list(data.get('data', []))
+        elif isinstance(data, list):
+            return data
+        else:
+            return []
    
+    @staticmethod
+    def _iter_month_entries(entries, dates, year, month):
+        """Return the daily metrics entries whose date falls within the given month, from entries sorted by date."""
+        target_date_prefix = _month_prefix(year, month)
+        start = bisect.bisect_left(dates, target_date_prefix)
+        # '\x7f' sorts after every character that can follow the prefix in an ISO date
+        end = bisect.bisect_left(dates, target_date_prefix + '\x7f', lo=start)
+        return entries[start:end]
    
+    @classmethod
+    def _aggregate(cls, entries, dates, year, month):
+        """
+        Total every Copilot metric for a month in a single pass over the daily entries.
+       
+        Args:
+            entries (list): Daily Copilot metrics entries, sorted by date
+            dates (list): Date of each entry, in the same order
+            year (str): Year (e.g. "2025")
+            month (str): Month (e.g. "05")
+           
+        Returns:
+            dict: 'engaged' (peak daily engaged users), 'suggested' and 'accepted' code lines, and 'chats'
+        """
+        engaged = suggested = accepted = chats = 0
+        for entry in cls._iter_month_entries(entries, dates, year, month):
+            engaged = max(engaged, entry.get('total_engaged_users', 0))
+           
+            completions = entry.get('copilot_ide_code_completions', {})
+            for editor in completions.get('editors', []):
+                for model in editor.get('models', []):
+                    for language in model.get('languages', []):
+                        try:
+                            language_suggested, language_accepted = _LANGUAGE_LINES(language)
+                        except KeyError:
+                            language_suggested = language.get('total_code_lines_suggested', 0)
+                            language_accepted = language.get('total_code_lines_accepted', 0)
+                        suggested += language_suggested
+                        accepted += language_accepted
+           
+            chat = entry.get('copilot_ide_chat', {})
+            for editor in chat.get('editors', []):
+                for model in editor.get('models', []):
+                    chats += model.get('total_chats', 0)
+        return {'engaged': engaged, 'suggested': suggested, 'accepted': accepted, 'chats': chats}
+   
+    def _monthly_totals(self, organization, year, month):
+        """
+        Get the aggregated Copilot metrics for a month, computing them once per fetched payload.
+       
+        Args:
+            organization (str): GitHub organization name
+            year (str): Year (e.g. "2025")
+            month (str): Month (e.g. "05")
+           
+        Returns:
+            dict: Monthly totals as returned by _aggregate
+           
+        Raises:
+            requests.exceptions.RequestException: If the metrics could not be fetched
+        """
+        month_is_final = self._is_month_final(year, month)
+        persisted_key = f"{self.base_url}|{organization}|{_month_prefix(year, month)}"
+        if month_is_final:
+            with self._persist_lock:
+                persisted = self._load_persisted_totals().get(persisted_key)
+            if persisted is not None:
+                return persisted
+       
+        entries, dates = self._fetch_copilot_metrics(organization)
+        key = (organization, _month_prefix(year, month))
+        cached = self._totals_cache.get(key)
+        # A new download replaces the entries list, so identity tells whether the totals are still current
+        if cached and cached[0] is entries:
+            return cached[1]
+        totals = self._aggregate(entries, dates, year, month)
+        self._totals_cache[key] = (entries, totals)
+       
+        # Only keep months that had data, so an unknown or aged out month is not frozen at zero
+        if month_is_final and any(totals.values()):
+            self._persist_totals(persisted_key, totals)
+        return totals
+   
+    def _is_month_final(self, year, month):
+        """Return True if the month ended at least PERSIST_AFTER_DAYS days ago, so its metrics no longer change."""
+        year_int = int(year)
+        month_int = int(month)
+        _, last_day = calendar.monthrange(year_int, month_int)
+        final_at = datetime(year_int, month_int, last_day, tzinfo=timezone.utc) + timedelta(days=1 + self.PERSIST_AFTER_DAYS)
+        return datetime.now(timezone.utc) >= final_at
+   
+    def _load_persisted_totals(self):
+        """Return the totals kept in cache_file, reading the file on first use. Call with _persist_lock held."""
+        if self._persisted_totals is None:
+            self._persisted_totals = {}
+            if os.path.exists(self.cache_file):
+                try:
+                    with open(self.cache_file, 'r') as f:
+                        data = json.load(f)
+                    if isinstance(data, dict):
+                        self._persisted_totals = data
+                except (json.JSONDecodeError, IOError) as e:
+                    self.logger.warning(3, f"Error reading cache file: {e}")
+        return self._persisted_totals
+   
+    def _persist_totals(self, key, totals):
+        """Add a finished month's totals to cache_file, replacing the file atomically."""
+        with self._persist_lock:
+            persisted = self._load_persisted_totals()
+            persisted[key] = totals
+            cache_dir = os.path.dirname(os.path.abspath(self.cache_file))
+            temp_file = None
+            try:
+                os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+                # Write through a freshly created, uniquely named file in the same directory, then swap it in
+                fd, temp_file = tempfile.mkstemp(dir=cache_dir, prefix=".github_copilot_totals_", suffix=".tmp")
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(persisted, f)
+                os.replace(temp_file, self.cache_file)
+            except (IOError, OSError) as e:
+                self.logger.error(3, f"Error writing to cache file: {e}")
+                if temp_file and os.path.exists(temp_file):
+                    os.remove(temp_file)
+   
+    @_safe_api(0, "fetching GitHub Copilot active users")
     def get_active_users(self, organization, year, month):
         """
         Get the number of active Copilot users for an organization.
@@ -60,41 +494,33 @@ class GitHubDataSource:
         Returns:
             int: Maximum number of active Copilot users for the month
         """
-        # Construct API endpoint for Copilot metrics
-        api_endpoint = f"/enterprises/{organization}/copilot/metrics"
-        url = urljoin(self.base_url, api_endpoint)
+        # Get the maximum total_engaged_users for the month
+        return self._monthly_totals(organization, year, month)['engaged']
        
-        try:
-            # Query the GitHub API for Copilot metrics without any parameters
-            if self.auth:
-                response = requests.get(url, headers=self.headers, auth=self.auth)
-            else:
-                response = requests.get(url, headers=self.headers)
-               
-            response.raise_for_status()
-            data = response.json()
- 
-            # Handle if data is a list or dict
-            if isinstance(data, dict):
-                entries = data.get('data', [])
-            elif isinstance(data, list):
-                entries = data
-            else:
-                entries = []
- 
-            target_date_prefix = f"{year}-{month:0>2}"  # Ensures month is two digits
- 
-            # Get the maximum total_engaged_users for the month
-            max_active_users = max(
-                (entry.get('total_engaged_users', 0)
-                 for entry in entries
-                 if entry.get('date', '').startswith(target_date_prefix)),
-                default=0            )
-            return max_active_users
-        except requests.exceptions.RequestException as e:
-            self.logger.error(3, f"Error fetching GitHub Copilot active users: {e}")
-            return 0  # Return 0 if there's an error
+    def get_active_users_many(self, organizations, year, month, max_workers=4):
+        """
+        Get the number of active Copilot users for several organizations concurrently.
+       
+        The organizations' metrics are fetched in parallel over the shared session, with the
+        worker count kept small to stay clear of GitHub's secondary rate limits.
+       
+        Args:
+            organizations (list): GitHub organization names
+            year (str): Year (e.g. "2025")
+            month (str): Month (e.g. "05")
+            max_workers (int, optional): Maximum number of concurrent API requests
+           
+        Returns:
+            dict: Maximum number of active Copilot users for the month, keyed by organization
+        """
+        organizations = list(dict.fromkeys(organizations))
+        if not organizations:
+            return {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(organizations))) as executor:
+            results = executor.map(lambda organization: self.get_active_users(organization, year, month), organizations)
+            return dict(zip(organizations, results))
        
+    @_safe_api(0, "fetching GitHub Copilot suggested lines")
     def get_copilot_suggested_lines(self, organization, year, month):
         """
         Get the total number of code lines suggested by GitHub Copilot for an organization.
@@ -107,42 +533,9 @@ class GitHubDataSource:
         Returns:
             int: Total number of lines suggested by Copilot for the month
         """
-        # Construct API endpoint for Copilot metrics
-        api_endpoint = f"/enterprises/{organization}/copilot/metrics"
-        url = urljoin(self.base_url, api_endpoint)
-       
-        try:
-            # Query the GitHub API for Copilot metrics without any parameters
-            if self.auth:
-                response = requests.get(url, headers=self.headers, auth=self.auth)
-            else:
-                response = requests.get(url, headers=self.headers)
-               
-            response.raise_for_status()
-            data = response.json()
-            # Handle if data is a list or dict
-            if isinstance(data, dict):
-                entries = data.get('data', [])
-            elif isinstance(data, list):
-                entries = data
-            else:
-                entries = []
- 
-            target_date_prefix = f"{year}-{month:0>2}"  # Ensures month is two digits
- 
-            total_suggested_lines = 0
-            for entry in entries:
-                if entry.get('date', '').startswith(target_date_prefix):
-                    completions = entry.get('copilot_ide_code_completions', {})
-                    editors = completions.get('editors', [])
-                    for editor in editors:
-                        for model in editor.get('models', []):
-                            for language in model.get('languages', []):                                total_suggested_lines += language.get('total_code_lines_suggested', 0)
-            return total_suggested_lines
-        except requests.exceptions.RequestException as e:
-            self.logger.error(3, f"Error fetching GitHub Copilot suggested lines: {e}")
-            return 0  # Return 0 if there's an error
+        return self._monthly_totals(organization, year, month)['suggested']
        
+    @_safe_api(0, "fetching GitHub Copilot accepted lines")
     def get_copilot_accepted_lines(self, organization, year, month):
         """
         Get the total number of code lines accepted by GitHub Copilot for an organization.
@@ -155,41 +548,9 @@ class GitHubDataSource:
         Returns:
             int: Total number of lines accepted by Copilot for the month
         """
-        api_endpoint = f"/enterprises/{organization}/copilot/metrics"
-        url = urljoin(self.base_url, api_endpoint)
- 
-        try:
-            if self.auth:
-                response = requests.get(url, headers=self.headers, auth=self.auth)
-            else:
-                response = requests.get(url, headers=self.headers)
- 
-            response.raise_for_status()
-            data = response.json()
-            # Handle if data is a list or dict
-            if isinstance(data, dict):
-                entries = data.get('data', [])
-            elif isinstance(data, list):
-                entries = data
-            else:
-                entries = []
- 
-            target_date_prefix = f"{year}-{month:0>2}"
- 
-            total_accepted_lines = 0
-            for entry in entries:
-                if entry.get('date', '').startswith(target_date_prefix):
-                    completions = entry.get('copilot_ide_code_completions', {})
-                    editors = completions.get('editors', [])
-                    for editor in editors:
-                        for model in editor.get('models', []):
-                            for language in model.get('languages', []):
-                                total_accepted_lines += language.get('total_code_lines_accepted', 0)
-            return total_accepted_lines
-        except requests.exceptions.RequestException as e:
-            self.logger.error(3, f"Error fetching GitHub Copilot accepted lines: {e}")
-            return 0  # Return 0 if there's an error
+        return self._monthly_totals(organization, year, month)['accepted']
        
+    @_safe_api(0.0, "calculating Copilot adoption rate")
     def get_copilot_adoption_rate(self, organization, year, month):
         """
         Calculate the GitHub Copilot adoption rate for an organization based on accepted/suggested lines.
@@ -202,47 +563,16 @@ class GitHubDataSource:
         Returns:
             float: Copilot adoption rate (accepted lines / suggested lines) for the month, rounded to 4 decimal places
         """
-        api_endpoint = f"/enterprises/{organization}/copilot/metrics"
-        url = urljoin(self.base_url, api_endpoint)
-
-        try:
-            if self.auth:
-                response = requests.get(url, headers=self.headers, auth=self.auth)
-            else:
-                response = requests.get(url, headers=self.headers)
-
-            response.raise_for_status()
-            data = response.json()
-            # Handle if data is a list or dict
-            if isinstance(data, dict):
-                entries = data.get('data', [])
-            elif isinstance(data, list):
-                entries = data
-            else:
-                entries = []
-
-            target_date_prefix = f"{year}-{month:0>2}"
-
-            total_accepted_lines = 0
-            total_suggested_lines = 0
-            for entry in entries:
-                if entry.get('date', '').startswith(target_date_prefix):
-                    completions = entry.get('copilot_ide_code_completions', {})
-                    editors = completions.get('editors', [])
-                    for editor in editors:
-                        for model in editor.get('models', []):
-                            for language in model.get('languages', []):
-                                total_accepted_lines += language.get('total_code_lines_accepted', 0)
-                                total_suggested_lines += language.get('total_code_lines_suggested', 0)
-            if total_suggested_lines > 0:
-                adoption_rate = total_accepted_lines / total_suggested_lines
-            else:
-                adoption_rate = 0.0
-            return round(adoption_rate, 4)
-        except requests.exceptions.RequestException as e:
-            self.logger.error(3, f"Error calculating Copilot adoption rate: {e}")
-            return 0.0
+        totals = self._monthly_totals(organization, year, month)
+        total_accepted_lines = totals['accepted']
+        total_suggested_lines = totals['suggested']
+        if total_suggested_lines > 0:
+            adoption_rate = total_accepted_lines / total_suggested_lines
+        else:
+            adoption_rate = 0.0
+        return round(adoption_rate, 4)
        
+    @_safe_api(0, "fetching GitHub Copilot AI usage")
     def get_ai_usage(self, organization, year, month):
         """
         Get the total number of Copilot Chat interactions (total_chats) for an organization.
@@ -255,40 +585,36 @@ class GitHubDataSource:
         Returns:
             int: Total number of Copilot Chat interactions for the month
         """
-        api_endpoint = f"/enterprises/{organization}/copilot/metrics"
-        url = urljoin(self.base_url, api_endpoint)
- 
-        try:
-            if self.auth:
-                response = requests.get(url, headers=self.headers, auth=self.auth)
-            else:
-                response = requests.get(url, headers=self.headers)
- 
-            response.raise_for_status()
-            data = response.json()
-            # Handle if data is a list or dict
-            if isinstance(data, dict):
-                entries = data.get('data', [])
-            elif isinstance(data, list):
-                entries = data
-            else:
-                entries = []
- 
-            target_date_prefix = f"{year}-{month:0>2}"
- 
-            total_chats = 0
-            for entry in entries:
-                if entry.get('date', '').startswith(target_date_prefix):
-                    chat = entry.get('copilot_ide_chat', {})
-                    editors = chat.get('editors', [])
-                    for editor in editors:
-                        for model in editor.get('models', []):
-                            total_chats += model.get('total_chats', 0)
-            return total_chats
-        except requests.exceptions.RequestException as e:
-            self.logger.error(3, f"Error fetching GitHub Copilot AI usage: {e}")
-            return 0  # Return 0 if there's an error
+        return self._monthly_totals(organization, year, month)['chats']
 
+    def get_all_metrics(self, organization, year, month):
+        """
+        Get every Copilot metric for an organization, fetching the metrics and seats endpoints concurrently.
+       
+        The five metric getters share one metrics download, so the only independent request
+        is the seats lookup, which runs on a worker thread while the metrics are fetched.
+       
+        Args:
+            organization (str): GitHub organization name
+            year (str): Year (e.g. "2025")
+            month (str): Month (e.g. "05")
+           
+        Returns:
+            dict: Metric values keyed by the collector's metric names, plus 'total_seats'
+        """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            seats_future = executor.submit(self.get_total_seats, organization)
+            metrics = {
+                'active_users': self.get_active_users(organization, year, month),
+                'suggested_lines': self.get_copilot_suggested_lines(organization, year, month),
+                'accepted_lines': self.get_copilot_accepted_lines(organization, year, month),
+                'adoption_rate': self.get_copilot_adoption_rate(organization, year, month),
+                'ai_usage': self.get_ai_usage(organization, year, month),
+            }
+            metrics['total_seats'] = seats_future.result()
+        return metrics
+   
+    @_safe_api(0, "fetching GitHub Copilot total seats")
     def get_total_seats(self, organization):
         """
         Get the total number of Copilot seats for an organization (enterprise).
@@ -300,15 +626,8 @@ class GitHubDataSource:
             int: Total number of Copilot seats (total_seats)
         """
         api_endpoint = f"/enterprises/{organization}/copilot/billing/seats"
-        url = urljoin(self.base_url, api_endpoint)
-        try:
-            if self.auth:
-                response = requests.get(url, headers=self.headers, auth=self.auth)
-            else:
-                response = requests.get(url, headers=self.headers)
-            response.raise_for_status()
-            data = response.json()
-            return data.get('total_seats', 0)
-        except requests.exceptions.RequestException as e:
-            self.logger.error(3, f"Error fetching GitHub Copilot total seats: {e}")
-            return 0
\ No newline at end of file
+        url = f"{self.base_url}{api_endpoint}"
+        response = self._get(url)
+        response.raise_for_status()
+        data = response_json(response)
+        return data.get('total_seats', 0)
\ No newline at end of file
@@ -2,19 +2,85 @@
 Jenkins data source for retrieving metrics from a Jenkins server.
 """
  
+import time
+import threading
+import concurrent.futures
 import requests
 from datetime import datetime
-import calendar
+import functools
 from urllib.parse import urljoin
 import json
+from src.utils.fast_json import response_json
+from src.utils.http import make_session, SessionMixin
 from src.utils.logger import get_logger
  
  
-class JenkinsDataSource:
+# Only the action fields that get_code_coverage reads, rather than every field of every build action
+_COVERAGE_TREE = 'builds[number,timestamp,result,actions[_class,lineCoverage,jacoco[percentageFloat],cobertura[lineCoverage]]]'
+
+
+# Coverage plugins by the key their build action reports under, as (value field, multiplier to a percentage),
+# checked in order so JaCoCo wins over Cobertura when an action carries both
+_COVERAGE_FIELDS = {
+    'jacoco': ('percentageFloat', 1),
+    'cobertura': ('lineCoverage', 100),
+}
+
+
+def _action_coverage(action):
+    """Return the coverage percentage reported by a Jenkins build action, or None if it has none."""
+    for plugin, (field, multiplier) in _COVERAGE_FIELDS.items():
+        if plugin in action:
+            coverage = action.get(plugin, {}).get(field)
+            return coverage * multiplier if coverage is not None else None
+    # Check for generic coverage report
+    if action.get('_class', '').endswith('CoverageAction'):
+        coverage = action.get('lineCoverage')
+        return coverage * 100 if coverage is not None else None  # Convert to percentage
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def _deployment_job_url(base_url, deployment_job):
+    """Return the JSON API URL for a deployment job given as a job path or a '/'-separated name."""
+    # Format the job path for URL using '/job/' between each part
+    # If the path already has '/job/' segments, use it as is; otherwise split by '/'
+    if '/job/' in deployment_job:
+        encoded_path = deployment_job
+    else:
+        encoded_path = '/job/'.join(deployment_job.split('/'))
+   
+    # Ensure it ends with a trailing slash for the API path
+    if not encoded_path.endswith('/'):
+        encoded_path += '/'
+   
+    return f"{base_url}/job/{encoded_path}api/json"
+
+
+@functools.lru_cache(maxsize=256)
+def _coverage_job_url(base_url, job_path):
+    """Return the JSON API URL for a job in folders/branches given as a '/'-separated path."""
+    # Handle both simple jobs and jobs in folders/branches
+    api_path = '/job/' + '/job/'.join(job_path.split('/')) + '/api/json'
+    return urljoin(base_url, api_path)
+
+
+@functools.lru_cache(maxsize=64)
+def _local_month_bounds_ms(year_int, month_int):
+    """Return the start and exclusive end of a month in server local time, as epoch milliseconds."""
+    start = datetime(year_int, month_int, 1)
+    end = datetime(year_int + month_int // 12, month_int % 12 + 1, 1)
+    return int(start.timestamp() * 1000), int(end.timestamp() * 1000)
+
+
+class JenkinsDataSource(SessionMixin):
     """
     Data source for connecting to a Jenkins server and retrieving metrics.
     """
    
+    # Seconds a job's build history is reused before Jenkins is queried again
+    BUILDS_CACHE_TTL = 300
+   
     def __init__(self, base_url, token=None, username=None, password=None):
         """
         Initialize the JenkinsDataSource.
@@ -46,6 +112,40 @@ class JenkinsDataSource:
             self.auth = (username, password)
         else:
             raise ValueError("Either token or username/password must be provided for authentication")
+       
+        self.session = make_session(self.headers, self.auth)
+       
+        # Build lists per (job URL, tree) as (fetched_at, builds), so querying several months of a job downloads it once
+        self._builds_cache = {}
+        self._builds_lock = threading.Lock()
+   
+    def _get_builds(self, url, tree):
+        """
+        Fetch the builds of a Jenkins job, reusing the result for BUILDS_CACHE_TTL seconds.
+       
+        Args:
+            url (str): Job API URL
+            tree (str): Jenkins tree parameter selecting the build fields to return
+           
+        Returns:
+            list: Builds of the job, newest first
+           
+        Raises:
+            requests.exceptions.RequestException: If the builds could not be fetched
+        """
+        key = (url, tree)
+        with self._builds_lock:
+            cached = self._builds_cache.get(key)
+        if cached and time.monotonic() - cached[0] < self.BUILDS_CACHE_TTL:
+            return cached[1]
+       
+        response = self.session.get(url, params={'tree': tree})
+        response.raise_for_status()
+        builds = response_json(response).get('builds', [])
+       
+        with self._builds_lock:
+            self._builds_cache[key] = (time.monotonic(), builds)
+        return builds
  
     def get_deployment_frequency(self, deployment_job, year, month):
         """
@@ -59,42 +159,24 @@ class JenkinsDataSource:
         Returns:
             int: Number of successful deployments for the given job and month
         """
-        # Calculate start and end dates for the month
-        year_int = int(year)
-        month_int = int(month)
+        # Calculate start and end of the month in Australian (server local) time, as Jenkins epoch milliseconds
+        start_ms, end_ms = _local_month_bounds_ms(int(year), int(month))
          
-        # Format the job path for URL using '/job/' between each part
-        # If the path already has '/job/' segments, use it as is; otherwise split by '/'
-        if '/job/' in deployment_job:
-            encoded_path = deployment_job
-        else:
-            encoded_path = '/job/'.join(deployment_job.split('/'))
-       
-        # Ensure it ends with a trailing slash for the API path
-        if not encoded_path.endswith('/'):
-            encoded_path += '/'
-       
         # Construct API endpoint for job builds
-        api_url = f"{self.base_url}/job/{encoded_path}api/json"
-       
-        # Parameters for the API request
-        params = {
-            'tree': 'builds[number,timestamp,result,duration]',  # Get only the fields we need
-        }
+        api_url = _deployment_job_url(self.base_url, deployment_job)
        
         try:
-            response = requests.get(api_url, headers=self.headers, params=params, auth=self.auth)
-            response.raise_for_status()
-            data = response.json()
+            builds = self._get_builds(api_url, 'builds[number,timestamp,result,duration]')  # Get only the fields we need
              
+            # Count builds in the target month, regardless of result, comparing raw timestamps
+            # instead of converting each build to a datetime
             successful_deployments = 0
-            for build in data.get('builds', []):
+            for build in builds:
                 build_timestamp = build.get('timestamp', 0)
-                # Convert to datetime in Australian timezone
-                build_time = datetime.fromtimestamp(build_timestamp / 1000)
-               
-                # Check if the build is in the target month and year, regardless of result
-                if build_time.year == year_int and build_time.month == month_int:
+                # Jenkins lists builds newest first, so every build after this one is before the month
+                if build_timestamp < start_ms:
+                    break
+                if build_timestamp < end_ms:
                     successful_deployments += 1
                    
             return successful_deployments
@@ -102,6 +184,29 @@ class JenkinsDataSource:
             self.logger.error(3, f"Error fetching deployment data from Jenkins: {e}")
             return 0
  
+    def get_deployment_frequency_many(self, deployment_jobs, year, month, max_workers=8):
+        """
+        Get the deployment frequency for several Jenkins jobs concurrently.
+       
+        The jobs are queried in parallel over the shared session, which releases the GIL while
+        waiting on Jenkins, so total time is close to the slowest job rather than the sum.
+       
+        Args:
+            deployment_jobs (list): Jenkins job identifiers
+            year (str): Year (e.g. "2025")
+            month (str): Month (e.g. "05")
+            max_workers (int, optional): Maximum number of concurrent API requests
+           
+        Returns:
+            dict: Number of deployments for the given month, keyed by job identifier
+        """
+        deployment_jobs = list(dict.fromkeys(deployment_jobs))
+        if not deployment_jobs:
+            return {}
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(deployment_jobs))) as executor:
+            results = executor.map(lambda job: self.get_deployment_frequency(job, year, month), deployment_jobs)
+            return dict(zip(deployment_jobs, results))
+ 
     def get_code_coverage(self, project, year, month):
         """
         Get the code coverage percentage for a specific project and month.
@@ -115,16 +220,8 @@ class JenkinsDataSource:
             float: Average code coverage percentage for the given project and month,
                 or None if no coverage data is available
         """
-        # Calculate start and end dates for the month
-        year_int = int(year)
-        month_int = int(month)
-       
-        # Get the last day of the month
-        _, last_day = calendar.monthrange(year_int, month_int)
-       
-        # Format dates for the API (Jenkins uses milliseconds since epoch)
-        start_date = int(datetime(year_int, month_int, 1, 0, 0, 0).timestamp() * 1000)
-        end_date = int(datetime(year_int, month_int, last_day, 23, 59, 59).timestamp() * 1000)
+        # Calculate start and end of the month (Jenkins uses milliseconds since epoch)
+        start_date, end_date = _local_month_bounds_ms(int(year), int(month))
        
         # Process the project to determine the job path in Jenkins
         # This assumes project names follow a format like "DPI/mac-motor-bicc-ui"
@@ -140,43 +237,24 @@ class JenkinsDataSource:
             job_path = project
        
         # Construct API endpoint for job builds
-        # Handle both simple jobs and jobs in folders/branches
-        api_path = '/job/' + '/job/'.join(job_path.split('/')) + '/api/json'
-        url = urljoin(self.base_url, api_path)
+        url = _coverage_job_url(self.base_url, job_path)
            
-        # Parameters for the API request
-        params = {
-            'tree': 'builds[number,timestamp,result,actions[*]]',  # Need actions for coverage data
-        }
-       
         try:
-            response = requests.get(url, headers=self.headers, params=params, auth=self.auth)
-            response.raise_for_status()
-            data = response.json()
+            builds = self._get_builds(url, _COVERAGE_TREE)
            
             coverage_values = []
-            for build in data.get('builds', []):
+            for build in builds:
+                build_timestamp = build.get('timestamp', 0)
+                # Jenkins lists builds newest first, so every build after this one is before the month
+                if build_timestamp < start_date:
+                    break
                 # Check if build timestamp is within our range and was successful
-                if (start_date <= build.get('timestamp', 0) <= end_date and
-                    build.get('result') == 'SUCCESS'):
+                if build_timestamp < end_date and build.get('result') == 'SUCCESS':
                     # Get code coverage from build actions
-                    actions = build.get('actions', [])
-                    for action in actions:
-                        # Check for JaCoCo coverage data
-                        if 'jacoco' in action:
-                            coverage = action.get('jacoco', {}).get('percentageFloat')
-                            if coverage is not None:
-                                coverage_values.append(coverage)
-                        # Check for Cobertura coverage data
-                        elif 'cobertura' in action:
-                            coverage = action.get('cobertura', {}).get('lineCoverage')
-                            if coverage is not None:
-                                coverage_values.append(coverage * 100)  # Convert to percentage
-                        # Check for generic coverage report
-                        elif action.get('_class', '').endswith('CoverageAction'):
-                            coverage = action.get('lineCoverage')
-                            if coverage is not None:
-                                coverage_values.append(coverage * 100)  # Convert to percentage
+                    for action in build.get('actions', []):
+                        coverage = _action_coverage(action)
+                        if coverage is not None:
+                            coverage_values.append(coverage)
            
             if coverage_values:
                 # Calculate the average coverage
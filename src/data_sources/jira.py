@@ -2,19 +2,52 @@
 JIRA data source for retrieving metrics from a JIRA server.
 """
  
+import concurrent.futures
+import logging
 import requests
 from datetime import datetime
 import calendar
+import functools
 from urllib.parse import urljoin
-import json
+from src.utils.fast_json import response_json
+from src.utils.http import make_session, SessionMixin
 from src.utils.logger import get_logger
  
  
-class JiraDataSource:
+# JQL for issues of a project completed within a date range
+_STORY_POINTS_JQL = (
+    'project = "{project_key}" AND status in (Done, Closed, Resolved) '
+    'AND resolutiondate >= "{start_date}" AND resolutiondate <= "{end_date}"'
+)
+ 
+# Try both common story point fields; the JQL already filters on status and resolution date, so nothing else is fetched
+_STORY_POINTS_FIELDS = ("customfield_10010", "customfield_10026")
+ 
+ 
+@functools.lru_cache(maxsize=256)
+def _month_date_range(year, month):
+    """Return the first and last day of a month as zero-padded 'YYYY-MM-DD' strings."""
+    year_int = int(year)
+    month_int = int(month)
+   
+    # Get the last day of the month
+    _, last_day = calendar.monthrange(year_int, month_int)
+   
+    # Format dates for the API as zero-padded ISO dates, which JQL requires (a month of "5" is not valid)
+    return f"{year_int:04d}-{month_int:02d}-01", f"{year_int:04d}-{month_int:02d}-{last_day:02d}"
+ 
+ 
+class JiraDataSource(SessionMixin):
     """
     Data source for connecting to a JIRA server and retrieving metrics.
     """
    
+    # Issues requested per search page; JIRA returns fewer if its configured maximum is lower
+    SEARCH_PAGE_SIZE = 1000
+   
+    # Search pages fetched concurrently once the first page reveals the total
+    MAX_SEARCH_WORKERS = 4
+   
     def __init__(self, base_url, token=None, username=None, password=None):
         """
         Initialize the JiraDataSource.
@@ -48,6 +81,74 @@ class JiraDataSource:
             self.auth = (username, password)
         else:
             raise ValueError("Either token or username/password must be provided for authentication")
+       
+        self.session = make_session(self.headers, self.auth)
+   
+    def _api_url(self, path):
+        """
+        Build the URL for a JIRA REST path.
+       
+        Args:
+            path (str): REST path starting with '/rest/'
+           
+        Returns:
+            str: Full URL, including the /jira context path if the base URL does not already have it
+        """
+        # Make sure we're using the correct path with /jira/rest/...
+        if '/jira/' not in self.base_url:
+            # If base_url doesn't already have /jira/, add it
+            path = f"/jira{path}"
+        return urljoin(self.base_url, path)
+   
+    def _search_page(self, url, params, start_at):
+        """
+        Fetch one page of JQL search results.
+       
+        Args:
+            url (str): Search API URL
+            params (dict): Search query parameters without startAt
+            start_at (int): Index of the first issue to return
+           
+        Returns:
+            dict: Search response with 'issues', 'total' and 'maxResults'
+        """
+        response = self.session.get(url, params={**params, "startAt": start_at})
+        response.raise_for_status()
+        return response_json(response)
+   
+    def _search_issues(self, url, params):
+        """
+        Fetch every issue matching a JQL search, following pagination.
+       
+        The first page reveals the total and the page size JIRA actually honours, so the
+        remaining pages are then fetched concurrently over the shared session.
+       
+        Args:
+            url (str): Search API URL
+            params (dict): Search query parameters with jql, fields and maxResults
+           
+        Returns:
+            list: All matching issues
+           
+        Raises:
+            requests.exceptions.RequestException: If any page could not be fetched
+        """
+        first_page = self._search_page(url, params, 0)
+        issues = list(first_page.get('issues', []))
+        total = first_page.get('total', len(issues))
+        page_size = len(issues)
+        if page_size == 0 or page_size >= total:
+            return issues
+       
+        page_starts = range(page_size, total, page_size)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(self.MAX_SEARCH_WORKERS, len(page_starts))) as executor:
+            for page in executor.map(lambda start_at: self._search_page(url, params, start_at), page_starts):
+                issues.extend(page.get('issues', []))
+       
+        # Pages can come back short if issues change mid-search, so make a mismatch visible rather than silent
+        if len(issues) != total:
+            self.logger.warning(3, f"JIRA search reported {total} issues but returned {len(issues)}; totals may be incomplete")
+        return issues
    
     def get_story_points(self, project_key, year, month):
         """
@@ -62,69 +163,47 @@ class JiraDataSource:
             int: Number of completed story points for the given project and month
         """
         # Calculate start and end dates for the month
-        year_int = int(year)
-        month_int = int(month)
-       
-        # Get the last day of the month
-        _, last_day = calendar.monthrange(year_int, month_int)
+        start_date, end_date = _month_date_range(year, month)
        
-        # Format dates for the API
-        start_date = f"{year}-{month}-01"
-        end_date = f"{year}-{month}-{last_day}"        
         # Construct API endpoint for JQL search
-        # Make sure we're using the correct path with /jira/rest/api/2/search
-        if '/jira/' not in self.base_url:
-            # If base_url doesn't already have /jira/, add it
-            api_endpoint = "/jira/rest/api/2/search"
-        else:
-            # If it already has /jira/, just use normal path
-            api_endpoint = "/rest/api/2/search"
-           
-        url = urljoin(self.base_url, api_endpoint)
-       
-        # Create the JQL query for the project key
-        jql = f'project = "{project_key}" AND status in (Done, Closed, Resolved) AND resolutiondate >= "{start_date}" AND resolutiondate <= "{end_date}"'
-          # Request payload with JQL query
-        payload = {
-            "jql": jql,
-            "fields": ["customfield_10010", "customfield_10026", "status", "resolutiondate"], # Try both common story point fields
-            "maxResults": 1000  # Adjust as needed, may need pagination for large projects
+        url = self._api_url("/rest/api/2/search")
+       
+        # Query parameters with the JQL query for the project key; a GET search is retried like any other read
+        params = {
+            "jql": _STORY_POINTS_JQL.format(project_key=project_key, start_date=start_date, end_date=end_date),
+            "fields": ",".join(_STORY_POINTS_FIELDS),
+            "maxResults": self.SEARCH_PAGE_SIZE  # Larger projects are paginated by _search_issues
         }
        
         try:
-            if self.auth:
-                response = requests.post(url, headers=self.headers, data=json.dumps(payload), auth=self.auth)
-            else:
-                response = requests.post(url, headers=self.headers, data=json.dumps(payload))
-               
-            response.raise_for_status()
-            data = response.json()
+            issues = self._search_issues(url, params)
            
             # Sum up story points from all completed issues
             total_story_points = 0
             issues_with_points = 0
             issues_without_points = 0
            
-            self.logger.info(3, f"Found {len(data.get('issues', []))} issues in {project_key} for {year}-{month}")
+            self.logger.info(3, f"Found {len(issues)} issues in {project_key} for {year}-{month}")
+           
+            # Per-issue detail is debug output, so skip formatting it entirely unless debug logging is on
+            log_issues = self.logger.isEnabledFor(logging.DEBUG)
            
-            for issue in data.get('issues', []):
+            for issue in issues:
                 # Try multiple common story point fields - check customfield_10010 first (found in SNZPA1-2132)
-                story_points = None
+                fields = issue.get('fields', {})
                
                 # First try customfield_10010 (confirmed in our debug)
-                story_points = issue.get('fields', {}).get('customfield_10010')
+                story_points = fields.get('customfield_10010')
                
                 # If not found, try customfield_10026 which is sometimes used
                 if story_points is None:
-                    story_points = issue.get('fields', {}).get('customfield_10026')
-               
-                issue_key = issue.get('key', 'Unknown')
-                status = issue.get('fields', {}).get('status', {}).get('name', 'Unknown')
+                    story_points = fields.get('customfield_10026')
                
                 if story_points is not None and isinstance(story_points, (int, float)):
                     total_story_points += story_points
                     issues_with_points += 1
-                    self.logger.info(4, f"Issue {issue_key} (Status: {status}) has {story_points} story points")
+                    if log_issues:
+                        self.logger.debug(4, f"Issue {issue.get('key', 'Unknown')} has {story_points} story points")
                 else:
                     issues_without_points += 1
            
@@ -135,4 +214,73 @@ class JiraDataSource:
            
         except requests.exceptions.RequestException as e:
             self.logger.error(3, f"Error fetching story points from JIRA: {e}")
-            return 0
\ No newline at end of file
+            return 0
+   
+    def _get_closed_sprints(self, board_id):
+        """
+        Fetch every closed sprint of an agile board, following pagination.
+       
+        Args:
+            board_id (int): Agile board (rapid view) ID
+           
+        Returns:
+            list: Sprints with their id, name and completeDate/endDate
+           
+        Raises:
+            requests.exceptions.RequestException: If any page could not be fetched
+        """
+        url = self._api_url(f"/rest/agile/1.0/board/{board_id}/sprint")
+        sprints = []
+        start_at = 0
+        while True:
+            response = self.session.get(url, params={'state': 'closed', 'startAt': start_at})
+            response.raise_for_status()
+            page = response_json(response)
+            values = page.get('values', [])
+            sprints.extend(values)
+            if page.get('isLast', True) or not values:
+                return sprints
+            start_at += len(values)
+   
+    def get_story_points_via_velocity(self, rapid_view_id, year, month):
+        """
+        Get the completed story points for a board's sprints that completed in a specific month.
+       
+        JIRA already totals completed points per sprint for its velocity chart, so this reads those
+        totals instead of downloading and summing every resolved issue. The velocity chart covers
+        the board's most recent sprints, so older months may be incomplete.
+       
+        Args:
+            rapid_view_id (int): Agile board (rapid view) ID
+            year (str): Year (e.g. "2025")
+            month (str): Month (e.g. "05")
+           
+        Returns:
+            int: Number of story points completed in sprints that completed in the given month
+        """
+        target_month = f"{int(year):04d}-{int(month):02d}"
+        url = self._api_url("/rest/greenhopper/1.0/rapid/charts/velocity.json")
+       
+        try:
+            response = self.session.get(url, params={'rapidViewId': rapid_view_id})
+            response.raise_for_status()
+            velocity = response_json(response).get('velocityStatEntries', {})
+           
+            total_story_points = 0
+            for sprint in self._get_closed_sprints(rapid_view_id):
+                # Sprint dates are ISO timestamps in server time, so the month is their 'YYYY-MM' prefix
+                completed_at = sprint.get('completeDate') or sprint.get('endDate') or ''
+                if not completed_at.startswith(target_month):
+                    continue
+               
+                story_points = velocity.get(str(sprint.get('id')), {}).get('completed', {}).get('value')
+                if isinstance(story_points, (int, float)):
+                    total_story_points += story_points
+                    self.logger.info(4, f"Sprint {sprint.get('name', 'Unknown')} completed {story_points} story points")
+           
+            self.logger.info(3, f"Total story points from velocity for board {rapid_view_id}: {total_story_points}")
+            return total_story_points
+           
+        except requests.exceptions.RequestException as e:
+            self.logger.error(3, f"Error fetching velocity from JIRA: {e}")
+            return 0
@@ -2,18 +2,54 @@
 SonarQube data source for retrieving metrics from a SonarQube server.
 """
  
+import base64
 import requests
 from datetime import datetime, timedelta
 import calendar
+import functools
 from urllib.parse import urljoin
+from src.utils.fast_json import response_json
+from src.utils.http import make_session, SessionMixin
 from src.utils.logger import get_logger
  
  
-class SonarQubeDataSource:
+class _EncodedBasicAuth(requests.auth.AuthBase):
+    """HTTP Basic auth whose Authorization header is encoded once, rather than on every request."""
+   
+    def __init__(self, username, password):
+        # Encoded as latin-1, as requests' own HTTPBasicAuth does
+        credentials = base64.b64encode(f"{username}:{password}".encode('latin1')).decode('ascii')
+        self.header = f"Basic {credentials}"
+   
+    def __call__(self, request):
+        request.headers['Authorization'] = self.header
+        return request
+ 
+ 
+@functools.lru_cache(maxsize=256)
+def _month_created_range(year, month):
+    """Return the createdAfter and createdBefore dates covering a month, as 'YYYY-MM-DD' strings."""
+    year_int = int(year)
+    month_int = int(month)
+
+    # Get the last day of the month
+    _, last_day = calendar.monthrange(year_int, month_int)
+
+    # Format dates for the API
+    from_date = f"{year}-{month}-01"
+    # Add one day to last_day to make to_date inclusive
+    to_date_dt = datetime(year_int, month_int, last_day) + timedelta(days=1)
+    return from_date, to_date_dt.strftime("%Y-%m-%d")
+ 
+ 
+class SonarQubeDataSource(SessionMixin):
     """
     Data source for connecting to a SonarQube server and retrieving metrics.
     """
    
+    # Issue types counted per project and month, fetched together in one faceted search
+    ISSUE_TYPES = ("BUG", "CODE_SMELL", "VULNERABILITY")
+   
     def __init__(self, base_url, token=None, username=None, password=None):
         """
         Initialize the SonarQubeDataSource.
@@ -45,53 +81,125 @@ class SonarQubeDataSource:
             self.auth = (username, password)
         else:
             raise ValueError("Either token or username/password must be provided for authentication")
+       
+        self.session = make_session(self.headers, _EncodedBasicAuth(*self.auth))
+       
+        # Last responses per (URL, query parameters) as (conditional request headers, data), so unchanged results come back as 304s
+        self._conditional_cache = {}
+       
+        # Issue counts per (project key, year, month), keyed by issue type
+        self._issue_counts_cache = {}
+       
+        # Coverage measures responses per project key; they do not depend on the month
+        self._coverage_cache = {}
+   
+    def _get_json(self, url, params):
+        """
+        GET a SonarQube API URL and decode its JSON body, revalidating earlier responses.
+       
+        When an earlier response for the same URL and parameters carried an ETag or Last-Modified header, the
+        request is made conditional and a 304 Not Modified reuses the earlier data.
+       
+        Args:
+            url (str): Full API URL
+            params (dict): Query parameters, encoded by requests
+           
+        Returns:
+            dict: Decoded response data
+           
+        Raises:
+            requests.exceptions.RequestException: If the request fails
+        """
+        cache_key = (url, tuple(params.items()))
+        cached = self._conditional_cache.get(cache_key)
+        response = self.session.get(url, params=params, headers=cached[0] if cached else None)
+        if cached and response.status_code == 304:
+            self.logger.debug(3, f"SonarQube response not modified, reusing cached data for {response.url}")
+            return cached[1]
+        response.raise_for_status()
+        data = response_json(response)
+       
+        validators = {}
+        if response.headers.get('ETag'):
+            validators['If-None-Match'] = response.headers['ETag']
+        if response.headers.get('Last-Modified'):
+            validators['If-Modified-Since'] = response.headers['Last-Modified']
+        if validators:
+            self._conditional_cache[cache_key] = (validators, data)
+        return data
      
-    def _get_issues(self, project_key, year, month, issue_type):
+    def _get_issue_counts(self, project_key, year, month):
         """
-        Private helper method to get the number of issues of a specific type for a project and month.
+        Private helper method to get the number of issues of every tracked type for a project and month.
+       
+        All types are counted with one issue search, faceted by type, and the counts are cached
+        so bugs, code smells and vulnerabilities for the same project and month share that request.
 
         Args:
             project_key (str): SonarQube project key
             year (str): Year (e.g. "2025")
             month (str): Month (e.g. "05")
-            issue_type (str): Type of issue (BUG, CODE_SMELL, VULNERABILITY)
         
         Returns:
-            int: Number of issues reported by SonarQube
+            dict: Number of issues reported by SonarQube, keyed by issue type
+           
+        Raises:
+            requests.exceptions.RequestException: If the issues could not be fetched
         """
+        cache_key = (project_key, year, month)
+        if cache_key in self._issue_counts_cache:
+            return self._issue_counts_cache[cache_key]
+       
         # Calculate start and end dates for the month
-        year_int = int(year)
-        month_int = int(month)
-
-        # Get the last day of the month
-        _, last_day = calendar.monthrange(year_int, month_int)
-
-        # Format dates for the API
-        from_date = f"{year}-{month}-01"
-        # Add one day to last_day to make to_date inclusive
-        to_date_dt = datetime(year_int, month_int, last_day) + timedelta(days=1)
-        to_date = to_date_dt.strftime("%Y-%m-%d")
+        from_date, to_date = _month_created_range(year, month)
 
         # Construct API endpoint for issues
         api_endpoint = "/api/issues/search"
         url = urljoin(self.base_url, api_endpoint)
 
         # Parameters for the API request
-        # Add date filter to get unresolved issues created within the specified month
-        params = f'componentKeys={project_key}&types={issue_type}&ps=1&createdAfter={from_date}&createdBefore={to_date}&resolved=false'
+        # Add date filter to get unresolved issues created within the specified month, counted per type by the facet
+        issue_types = ','.join(self.ISSUE_TYPES)
+        params = {
+            'componentKeys': project_key,
+            'types': issue_types,
+            'ps': 1,
+            'facets': 'types',
+            'createdAfter': from_date,
+            'createdBefore': to_date,
+            'resolved': 'false'
+        }
 
-        self.logger.info(3, f"Searching for {issue_type} issues created between {from_date} and {to_date} for project {project_key}")
+        self.logger.info(3, f"Searching for {issue_types} issues created between {from_date} and {to_date} for project {project_key}")
 
-        try:
-            # Convert params to query string and append to URL
-            url_with_params = f"{url}?{params}" 
+        # Make request, letting requests encode the parameters
+        data = self._get_json(url, params)
         
-            # Make request with params in URL
-            response = requests.get(url_with_params, headers=self.headers, auth=self.auth)
-            response.raise_for_status()
-            data = response.json()
-            
-            total_issues = data.get('total', 0)
+        counts = dict.fromkeys(self.ISSUE_TYPES, 0)
+        for facet in data.get('facets', []):
+            if facet.get('property') == 'types':
+                for value in facet.get('values', []):
+                    if value.get('val') in counts:
+                        counts[value['val']] = value.get('count', 0)
+        
+        self._issue_counts_cache[cache_key] = counts
+        return counts
+
+    def _get_issues(self, project_key, year, month, issue_type):
+        """
+        Private helper method to get the number of issues of a specific type for a project and month.
+
+        Args:
+            project_key (str): SonarQube project key
+            year (str): Year (e.g. "2025")
+            month (str): Month (e.g. "05")
+            issue_type (str): Type of issue (BUG, CODE_SMELL, VULNERABILITY)
+        
+        Returns:
+            int: Number of issues reported by SonarQube
+        """
+        try:
+            total_issues = self._get_issue_counts(project_key, year, month)[issue_type]
             self.logger.info(3, f"Found {total_issues} {issue_type} issues for project {project_key}")
             
             # Return the count of issues
@@ -161,17 +269,21 @@ class SonarQubeDataSource:
         api_endpoint = "/api/measures/component"
         url = urljoin(self.base_url, api_endpoint)
        
-        # Parameters for the API request using query string
+        # Parameters for the API request
         # Get both overall and new code coverage metrics
-        params = f'component={project_key}:&metricKeys=coverage,new_coverage&branch=master'
+        params = {
+            'component': f'{project_key}:',
+            'metricKeys': 'coverage,new_coverage',
+            'branch': 'master'
+        }
        
         try:
-            # Convert params to query string and append to URL
-            url_with_params = f"{url}?{params}"
-            # Make request with params in URL
-            response = requests.get(url_with_params, headers=self.headers, auth=self.auth)
-            response.raise_for_status()
-            data = response.json()
+            # Coverage is the latest on the branch whatever the month, so each project is fetched once
+            data = self._coverage_cache.get(project_key)
+            if data is None:
+                # Make request, letting requests encode the parameters
+                data = self._get_json(url, params)
+                self._coverage_cache[project_key] = data
  
             self.logger.debug(3, f"Coverage API response data: {data}")
            
@@ -1,60 +1,97 @@
 import os
 import json
+import concurrent.futures
+import copy
+import functools
 import re
+from collections import Counter, defaultdict
 from datetime import datetime
-import pandas as pd
+from openpyxl import load_workbook
+from src.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Monthly CSV files read concurrently by load_all_data
+MAX_CSV_WORKERS = 8
+
+# YYYY-MM date embedded in metric and survey file names
+_DATE_RE = re.compile(r'(\d{4}-\d{2})')
+
+# Experience survey questions as (survey_data key, 0-based column index)
+_SURVEY_COLUMNS = (
+    ('writing_new_code', 8),
+    ('refactoring_code', 9),
+    ('writing_tests', 10),
+)
+
+# Text answers treated as unanswered, matching the default missing values of pandas.read_excel
+_MISSING_ANSWERS = frozenset({
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null',
+})
 
 def load_config(config_path="config/dashboard.json"):
     with open(config_path, "r") as f:
         return json.load(f)
 
+@functools.lru_cache(maxsize=1024)
 def extract_date_from_filename(filename):
-    match = re.search(r'(\d{4}-\d{2})', filename)
+    match = _DATE_RE.search(filename)
     if match:
+        year_month = match.group(1)
         try:
-            return datetime.strptime(match.group(1), "%Y-%m")
+            # The pattern guarantees digits, so build the date directly rather than through strptime
+            return datetime(int(year_month[:4]), int(year_month[5:7]), 1)
         except ValueError:
+            # Out of range months such as 2025-13
             return None
     return None
 
 def load_csv_data(file_path):
     data = {}
     with open(file_path, 'r') as f:
-        # Skip comment lines starting with //
-        lines = [line.strip() for line in f if not line.strip().startswith('//')]
-
-        for line in lines:
-            if line and ',' in line:
-                key, value = line.split(',', 1)
-                value = value.strip()
-
-                # Skip missing values like [] or empty
-                if value in ["", "[]"]:
-                    continue
-
-                try:
-                    if '.' in value:
-                        data[key] = float(value)
-                    else:
-                        data[key] = int(value)
-                except ValueError:
-                    # If not numeric, skip or log
-                    continue
+        # Parse each line as it is read, stripping it once
+        for line in f:
+            line = line.strip()
+
+            # Skip comment lines starting with // and lines without a key,value pair
+            if line.startswith('//'):
+                continue
+            key, sep, value = line.partition(',')
+            if not sep:
+                continue
+            value = value.strip()
+
+            # Skip missing values like [] or empty
+            if value in ["", "[]"]:
+                continue
+
+            try:
+                if '.' in value:
+                    data[key] = float(value)
+                else:
+                    data[key] = int(value)
+            except ValueError:
+                # If not numeric, skip or log
+                continue
 
     return data
 
 
 def get_latest_excel_file(folder):
     """Find the most recent .xlsx file in the folder based on filename date."""
-    excel_files = [f for f in os.listdir(folder) if f.endswith('.xlsx')]
+    with os.scandir(folder) as entries:
+        # Pair each workbook with the date in its filename (assuming YYYY-MM format), parsing every name once
+        excel_files = [
+            (extract_date_from_filename(entry.name) or datetime.min, entry.name, entry.path)
+            for entry in entries
+            if entry.name.endswith('.xlsx') and entry.is_file()
+        ]
     if not excel_files:
         return None
     
-    # Sort by date in filename (assuming YYYY-MM format)
-    sorted_files = sorted(excel_files, key=lambda x: extract_date_from_filename(x) or datetime.min)
-    if sorted_files:
-        return os.path.join(folder, sorted_files[-1])  # Return the latest file
-    return None
+    # Only the latest file is needed, so take the maximum rather than sorting them all
+    return max(excel_files)[2]
 
 def load_survey_data(ongoing_folder):
     """Load survey data from the latest Excel file in the ongoing folder."""
@@ -62,18 +99,47 @@ def load_survey_data(ongoing_folder):
     if not excel_file:
         return None
     
+    # The dashboard loads the survey more than once per render, so reuse the parse until the file changes
     try:
-        df = pd.read_excel(excel_file)
-        survey_data = {
-            'writing_new_code': df.iloc[:, 8].value_counts().to_dict(),
-            'refactoring_code': df.iloc[:, 9].value_counts().to_dict(),
-            'writing_tests': df.iloc[:, 10].value_counts().to_dict(),
-            'source_file': os.path.basename(excel_file)
-        }
-        return survey_data
+        stat = os.stat(excel_file)
+        survey_data = _load_survey_file(os.path.abspath(excel_file), stat.st_mtime_ns, stat.st_size)
     except Exception as e:
-        print(f"Error loading survey data: {e}")
+        # Failures propagate out of the cached parse, so lru_cache never memoizes them
+        logger.error(1, f"Error loading survey data: {e}")
         return None
+    # Hand out a copy so callers cannot change the cached result
+    return copy.deepcopy(survey_data)
+
+@functools.lru_cache(maxsize=8)
+def _load_survey_file(excel_file, mtime_ns, size):
+    """Count the survey answers in an Excel file; mtime_ns and size key the cache on the file's version."""
+    # Stream the sheet row by row in read-only mode rather than building a DataFrame of every column
+    answer_counts = {key: Counter() for key, _ in _SURVEY_COLUMNS}
+    workbook = load_workbook(excel_file, read_only=True, data_only=True)
+    try:
+        # Read-only mode trusts the sheet's stored dimension, which can be stale (e.g. A1:A1), so recompute it
+        ws = workbook.active
+        ws.reset_dimensions()
+        rows = ws.iter_rows(values_only=True)
+        num_columns = len(next(rows, ()))
+        for row in rows:
+            num_columns = max(num_columns, len(row))
+            for key, idx in _SURVEY_COLUMNS:
+                # Skip unanswered cells, including the placeholders pandas reads as missing
+                value = row[idx] if idx < len(row) else None
+                if value is not None and value not in _MISSING_ANSWERS:
+                    answer_counts[key][value] += 1
+    finally:
+        workbook.close()
+    
+    missing = [idx for _, idx in _SURVEY_COLUMNS if idx >= num_columns]
+    if missing:
+        raise IndexError(f"survey has {num_columns} columns, column index {missing[0]} is out of bounds")
+    
+    # Most frequent answer first, as pandas value_counts ordered them
+    survey_data = {key: dict(counts.most_common()) for key, counts in answer_counts.items()}
+    survey_data['source_file'] = os.path.basename(excel_file)
+    return survey_data
 
 def load_all_data(baseline_folder, ongoing_folder):
     baseline_file = os.path.join(baseline_folder, "baseline.csv")
@@ -81,21 +147,32 @@ def load_all_data(baseline_folder, ongoing_folder):
 
     time_series_data = {}
     if os.path.exists(ongoing_folder):
-        for filename in sorted(os.listdir(ongoing_folder)):
-            if filename.endswith(".csv"):
-                date = extract_date_from_filename(filename)
-                if date:
-                    filepath = os.path.join(ongoing_folder, filename)
-                    time_series_data[date] = load_csv_data(filepath)
-
-    # Calculate simple average for each metric
-    average_data = {}
-    if time_series_data:
-        all_keys = set().union(*(d.keys() for d in time_series_data.values()))
-        for key in all_keys:
-            values = [v[key] for v in time_series_data.values() if key in v]
-            if values:
-                average_data[key] = sum(values) / len(values)
+        # Filter to CSV files before sorting, reusing the paths scandir already built
+        with os.scandir(ongoing_folder) as entries:
+            csv_entries = [entry for entry in entries if entry.name.endswith(".csv") and entry.is_file()]
+        csv_entries.sort(key=lambda entry: entry.name)
+
+        monthly_files = []
+        for entry in csv_entries:
+            date = extract_date_from_filename(entry.name)
+            if date:
+                monthly_files.append((date, entry.path))
+
+        # Read the monthly files concurrently; map keeps them in filename order
+        if monthly_files:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=min(MAX_CSV_WORKERS, len(monthly_files))) as executor:
+                monthly_data = executor.map(load_csv_data, [filepath for _, filepath in monthly_files])
+                for (date, _), data in zip(monthly_files, monthly_data):
+                    time_series_data[date] = data
+
+    # Calculate simple average for each metric over the months that report it, in one pass over every value
+    sums = defaultdict(int)
+    counts = defaultdict(int)
+    for month_data in time_series_data.values():
+        for key, value in month_data.items():
+            sums[key] += value
+            counts[key] += 1
+    average_data = {key: total / counts[key] for key, total in sums.items()}
     
     # Load survey data from the latest Excel file
     survey_data = load_survey_data(ongoing_folder)
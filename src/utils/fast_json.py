@@ -0,0 +1,35 @@
+"""
+Fast JSON Module
+
+This module decodes JSON API responses with orjson when it is installed,
+falling back to the standard library json module otherwise.
+"""
+
+import requests
+
+try:
+    import orjson
+    loads = orjson.loads
+except ImportError:
+    import json
+    loads = json.loads
+
+
+def response_json(response):
+    """
+    Decode the JSON body of a requests response.
+
+    Args:
+        response: requests Response object
+
+    Returns:
+        The decoded JSON data
+
+    Raises:
+        requests.exceptions.JSONDecodeError: If the body is not valid JSON, as
+            response.json() would, so existing RequestException handlers still apply
+    """
+    try:
+        return loads(response.content)
+    except ValueError as e:
+        raise requests.exceptions.JSONDecodeError(str(e), response.text, 0)
@@ -0,0 +1,63 @@
+"""
+HTTP Session Module
+
+This module builds the pooled, retrying requests sessions shared by the
+data sources, and a mixin that lets a data source close its session.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Responses retried by default: rate limiting and transient server errors
+DEFAULT_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def make_session(headers, auth, status_forcelist=DEFAULT_RETRY_STATUSES, pool_connections=8, pool_maxsize=32,
+                 backoff_factor=0.3, respect_retry_after_header=True):
+    """
+    Create a keep-alive requests session with pooled connections and retries.
+
+    Requests made through one session reuse its pooled connections instead of
+    paying a new TCP and TLS handshake each.
+
+    Args:
+        headers (dict): Headers sent with every request
+        auth: Authentication for every request, as a (username, password) tuple, a requests AuthBase, or None
+        status_forcelist (iterable, optional): HTTP statuses that are retried
+        pool_connections (int, optional): Number of hosts to keep connection pools for
+        pool_maxsize (int, optional): Maximum connections kept per host
+        backoff_factor (float, optional): Exponential backoff factor between retries, in seconds
+        respect_retry_after_header (bool, optional): Whether retries sleep for a response's Retry-After
+
+    Returns:
+        requests.Session: Configured session, mounted for both http and https
+    """
+    session = requests.Session()
+    session.headers.update(headers)
+    session.auth = auth
+    retries = Retry(
+        total=3,
+        backoff_factor=backoff_factor,
+        status_forcelist=list(status_forcelist),
+        respect_retry_after_header=respect_retry_after_header,
+        raise_on_status=False  # Hand the final response back so raise_for_status reports it as before
+    )
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=retries)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+class SessionMixin:
+    """Mixin for data sources holding a requests session in self.session, so they can be closed or used with 'with'."""
+
+    def close(self):
+        """Close the underlying HTTP session and its pooled connections."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -115,6 +115,10 @@ class IndentLogger:
     def removeHandler(self, handler):
         """Remove a handler from the logger."""
         self.logger.removeHandler(handler)
+   
+    def isEnabledFor(self, level):
+        """Return True if a message at the given logging level would be emitted."""
+        return self.logger.isEnabledFor(level)
  
 # Create a function to get or create an IndentLogger
 def get_logger(name=None):